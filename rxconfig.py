@@ -1,9 +1,30 @@
 import reflex as rx
 import os
+from reflex.constants import Dirs, PageNames
+
+from terrigovsas.conexion import ConexionPorPaginaPlugin
+from terrigovsas.estilos import EstilosAtomicosPlugin
 
 config = rx.Config(
     app_name="terrigovsas",
-    plugins=[rx.plugins.TailwindV3Plugin()],
+    plugins=[
+        # Tailwind solo genera las clases que aparecen en las páginas y componentes
+        # compilados (incluidos los memoizados con estado, como el formulario de
+        # contacto); el runtime de utils/ no se escanea (sus cadenas "hidden",
+        # "block"... producían utilidades que nadie usa) y no se usa `prose`
+        rx.plugins.TailwindV3Plugin(
+            config={
+                "content": [
+                    f"./{Dirs.PAGES}/**/*.{{js,jsx}}",
+                    f"./{Dirs.UTILS}/{PageNames.COMPONENTS}.{{js,jsx}}",
+                    f"./{Dirs.UTILS}/{PageNames.STATEFUL_COMPONENTS}.{{js,jsx}}",
+                ],
+                "plugins": [],
+            }
+        ),
+        EstilosAtomicosPlugin(),
+        ConexionPorPaginaPlugin(),
+    ],
     backend_host="0.0.0.0",
     backend_port=3000,
     frontend_port=3000,
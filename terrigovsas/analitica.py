@@ -0,0 +1,226 @@
+"""Analítica de clics en CTAs: beacons, contadores en memoria y volcado periódico.
+
+El navegador avisa con `navigator.sendBeacon` (no bloquea la página ni espera
+respuesta). El servidor solo suma 1 en un contador preasignado: no hay E/S,
+ni locks, ni objetos nuevos por beacon. Cada worker de granian es un shard
+con sus propios contadores; una tarea de fondo los vuelca a SQLite cada
+INTERVALO segundos (y al apagar) sumando sobre lo que ya hay en la tabla.
+
+Rutas:
+- POST /_analitica/clic/<cta> y POST /_analitica/vista/pagina → 204
+- GET /_analitica/resumen[?desde=<epoch>] → totales y tasa de clic por servicio;
+  con el mismo acceso que /metrics (`metricas.permitido`)
+"""
+
+import asyncio
+import contextlib
+import json
+import time
+from datetime import datetime, timezone
+from urllib.parse import parse_qs
+
+import sqlalchemy
+from reflex.utils import console
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Field, SQLModel
+
+from terrigovsas import basedatos, metricas
+from terrigovsas.contenido import contenido
+
+PREFIJO = "/_analitica/"
+
+# Segundos por cubeta de tiempo y entre volcados a SQLite
+CUBETA = 3600
+INTERVALO = 15.0
+
+# CTAs conocidos; cualquier otro id se ignora (no crece la memoria)
+CTAS = (
+    "whatsapp-navbar",
+    "whatsapp-hero",
+    "whatsapp-contacto",
+    *(f"servicio-{servicio.slug}" for servicio in contenido().servicios),
+    *(f"whatsapp-{servicio.slug}" for servicio in contenido().servicios),
+)
+CLAVES = (*(f"clic/{cta}" for cta in CTAS), "vista/pagina")
+_INDICES = {clave: indice for indice, clave in enumerate(CLAVES)}
+
+# Lo que carga el navegador: un listener delegado para [data-cta] y una vista
+# por carga de la landing (las tasas de clic son sobre ella), ambos después
+# del primer pintado
+SCRIPT = f"""
+(() => {{
+  const beacon = (clave) => navigator.sendBeacon && navigator.sendBeacon("{PREFIJO}" + clave);
+  document.addEventListener("click", (evento) => {{
+    const cta = evento.target.closest && evento.target.closest("[data-cta]");
+    if (cta) beacon("clic/" + cta.dataset.cta);
+  }}, {{ capture: true, passive: true }});
+  if (location.pathname === "/") (window.requestIdleCallback || setTimeout)(() => beacon("vista/pagina"));
+}})();
+"""
+
+_SIN_CONTENIDO = {"type": "http.response.start", "status": 204, "headers": [(b"cache-control", b"no-store")]}
+_CUERPO_VACIO = {"type": "http.response.body", "body": b""}
+
+
+class ConteoCta(SQLModel, table=True):
+    """Clics (o vistas) de un CTA en una cubeta de tiempo"""
+
+    clave: str = Field(primary_key=True)
+    cubeta: datetime = Field(primary_key=True)
+    total: int = 0
+
+
+_cubeta = 0
+_conteos = [0] * len(CLAVES)
+# (cubeta, conteos) ya cerrados, pendientes de volcar
+_cerrados: list[tuple[int, list[int]]] = []
+
+
+def registrar(clave: str) -> bool:
+    """Suma un evento al contador de `clave`; False si la clave no existe"""
+    global _cubeta, _conteos
+    indice = _INDICES.get(clave)
+    if indice is None:
+        return False
+    cubeta = int(time.time()) // CUBETA
+    if cubeta != _cubeta:
+        # Cambio de cubeta: se cierran los contadores actuales (una vez por hora)
+        if any(_conteos):
+            _cerrados.append((_cubeta, _conteos))
+        _cubeta, _conteos = cubeta, [0] * len(CLAVES)
+    _conteos[indice] += 1
+    return True
+
+
+def _tomar() -> list[dict]:
+    """Filas a volcar; deja los contadores en cero"""
+    global _conteos
+    pendientes = [*_cerrados, (_cubeta, _conteos)]
+    _cerrados.clear()
+    _conteos = [0] * len(CLAVES)
+    # Una cubeta devuelta tras un fallo puede repetirse: una fila por (clave, cubeta)
+    totales: dict[tuple[int, int], int] = {}
+    for cubeta, conteos in pendientes:
+        for indice, total in enumerate(conteos):
+            if total:
+                totales[indice, cubeta] = totales.get((indice, cubeta), 0) + total
+    return [
+        {"clave": CLAVES[indice], "cubeta": datetime.fromtimestamp(cubeta * CUBETA, timezone.utc), "total": total}
+        for (indice, cubeta), total in totales.items()
+    ]
+
+
+def _devolver(filas: list[dict]) -> None:
+    """Vuelve a poner en los contadores cerrados unas filas que no se pudieron volcar"""
+    por_cubeta: dict[int, list[int]] = {}
+    for fila in filas:
+        cubeta = int(fila["cubeta"].timestamp()) // CUBETA
+        por_cubeta.setdefault(cubeta, [0] * len(CLAVES))[_INDICES[fila["clave"]]] += fila["total"]
+    _cerrados.extend(por_cubeta.items())
+
+
+def _volcar(filas: list[dict]) -> None:
+    sentencia = insert(ConteoCta).values(filas)
+    sentencia = sentencia.on_conflict_do_update(
+        index_elements=["clave", "cubeta"],
+        set_={"total": ConteoCta.total + sentencia.excluded.total},
+    )
+    with basedatos.motor().begin() as conexion:
+        conexion.execute(sentencia)
+
+
+def _ultimo_volcado(filas: list[dict]) -> None:
+    """Volcado al apagar: si falla se registra lo que se pierde, sin interrumpir el apagado"""
+    try:
+        _volcar(filas)
+    except Exception as error:
+        perdidos = ", ".join(f"{fila['clave']}={fila['total']}" for fila in filas)
+        console.error(f"Se perdieron {len(filas)} contadores al apagar ({perdidos}): {error}")
+
+
+async def _volcar_periodicamente() -> None:
+    while True:
+        await asyncio.sleep(INTERVALO)
+        if filas := _tomar():
+            try:
+                await asyncio.to_thread(_volcar, filas)
+            except sqlalchemy.exc.SQLAlchemyError as error:
+                # Se reintentan en el próximo volcado junto con los nuevos
+                _devolver(filas)
+                console.error(f"No se pudieron volcar {len(filas)} contadores, se reintentará: {error}")
+
+
+@contextlib.asynccontextmanager
+async def volcado_periodico():
+    """Tarea de vida de la app: vuelca los contadores cada INTERVALO y al apagar"""
+    tarea = asyncio.create_task(_volcar_periodicamente())
+    try:
+        yield
+    finally:
+        tarea.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await tarea
+        if filas := _tomar():
+            _ultimo_volcado(filas)
+
+
+def resumen(desde: datetime | None = None) -> dict:
+    """Totales por CTA desde `desde` y tasa de clic de cada tarjeta de servicio"""
+    consulta = sqlalchemy.select(ConteoCta.clave, sqlalchemy.func.sum(ConteoCta.total)).group_by(ConteoCta.clave)
+    if desde is not None:
+        consulta = consulta.where(ConteoCta.cubeta >= desde)
+    with basedatos.motor().connect() as conexion:
+        totales = dict(conexion.execute(consulta).all())
+    vistas = totales.get("vista/pagina", 0)
+    clics = {cta: totales.get(f"clic/{cta}", 0) for cta in CTAS}
+    return {
+        "vistas": vistas,
+        "clics": clics,
+        "tasa_servicios": {
+            cta.removeprefix("servicio-"): round(total / vistas, 4) if vistas else 0.0
+            for cta, total in clics.items()
+            if cta.startswith("servicio-")
+        },
+    }
+
+
+async def _responder_resumen(scope, send) -> None:
+    if not metricas.permitido(scope):
+        await send({**_SIN_CONTENIDO, "status": 404})
+        await send(_CUERPO_VACIO)
+        return
+    parametros = parse_qs(scope["query_string"].decode())
+    desde = None
+    if "desde" in parametros:
+        try:
+            desde = datetime.fromtimestamp(float(parametros["desde"][0]), timezone.utc)
+        except (ValueError, OverflowError, OSError):
+            await send({**_SIN_CONTENIDO, "status": 400})
+            await send(_CUERPO_VACIO)
+            return
+    cuerpo = json.dumps(await asyncio.to_thread(resumen, desde)).encode()
+    await send({"type": "http.response.start", "status": 200, "headers": [
+        (b"content-type", b"application/json"), (b"cache-control", b"no-store"),
+    ]})
+    await send({"type": "http.response.body", "body": cuerpo})
+
+
+def con_beacons(app):
+    """api_transformer de Reflex: atiende /_analitica/ antes que el resto del backend"""
+
+    async def asgi(scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(PREFIJO):
+            await app(scope, receive, send)
+            return
+        ruta = scope["path"][len(PREFIJO):]
+        if scope["method"] == "POST":
+            # El cuerpo del beacon no se lee: la clave va en la URL
+            await send(_SIN_CONTENIDO if registrar(ruta) else {**_SIN_CONTENIDO, "status": 404})
+        elif ruta == "resumen" and scope["method"] == "GET":
+            await _responder_resumen(scope, send)
+            return
+        else:
+            await send({**_SIN_CONTENIDO, "status": 405})
+        await send(_CUERPO_VACIO)
+
+    return asgi
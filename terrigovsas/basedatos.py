@@ -0,0 +1,25 @@
+"""Motor SQLite compartido por las solicitudes de contacto y la analítica"""
+
+import os
+from functools import lru_cache
+
+import sqlalchemy
+from sqlmodel import SQLModel, create_engine
+
+DB_URL = os.environ.get("TERRIGOV_DB", "sqlite:///solicitudes.db")
+
+
+@lru_cache(maxsize=1)
+def motor() -> sqlalchemy.Engine:
+    """Motor único; crea las tablas de los modelos importados la primera vez"""
+    motor = create_engine(DB_URL, connect_args={"check_same_thread": False})
+
+    @sqlalchemy.event.listens_for(motor, "connect")
+    def _pragmas(conexion, _):
+        # WAL permite leer mientras se escribe; varios workers comparten el archivo
+        conexion.execute("PRAGMA journal_mode=WAL")
+        conexion.execute("PRAGMA synchronous=NORMAL")
+        conexion.execute("PRAGMA busy_timeout=5000")
+
+    SQLModel.metadata.create_all(motor)
+    return motor
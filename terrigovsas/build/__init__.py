@@ -0,0 +1 @@
+"""Etapas de build de la landing (exportación estática y post-procesado)"""
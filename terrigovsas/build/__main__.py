@@ -0,0 +1,32 @@
+"""Pipeline de build estático: `python -m terrigovsas.build [destino]`"""
+
+import sys
+from pathlib import Path
+
+from terrigovsas.build import compresion, critico, export, fuentes, imagenes, pwa, recursos, sprite
+
+# Etapas que preparan assets antes de compilar, en orden
+ETAPAS_PREVIAS = [recursos.validar, imagenes.generar, fuentes.generar]
+
+# Etapas que post-procesan el sitio exportado, en orden; la PWA es opcional
+ETAPAS_POSTERIORES = [
+    sprite.generar,
+    critico.generar,
+    compresion.comprimir,
+    recursos.sugerir,
+    *([pwa.generar] if pwa.ACTIVADO else []),
+]
+
+
+def main(destino: Path = export.DIST_DIR) -> None:
+    """Ejecuta las etapas previas, exporta el sitio y lo post-procesa"""
+    for etapa in ETAPAS_PREVIAS:
+        etapa()
+    export.exportar(destino)
+    for etapa in ETAPAS_POSTERIORES:
+        etapa(destino)
+    print(f"Sitio estático listo en {destino}/")
+
+
+if __name__ == "__main__":
+    main(Path(sys.argv[1]) if len(sys.argv) > 1 else export.DIST_DIR)
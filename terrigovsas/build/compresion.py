@@ -0,0 +1,111 @@
+"""Etapa de compresión: nombres con hash, hermanos .br/.gz y manifiesto de caché"""
+
+import gzip
+import hashlib
+import json
+import re
+import shutil
+import sys
+from pathlib import Path
+
+import brotli
+
+from terrigovsas.build.export import DIST_DIR
+from terrigovsas.estaticos import MANIFIESTO
+
+# Extensiones que se precomprimen (las imágenes ya van comprimidas)
+COMPRIMIBLES = {
+    ".html", ".js", ".mjs", ".css", ".json", ".svg", ".txt", ".xml", ".ico", ".map",
+    ".webmanifest",
+}
+
+# Archivos de la raíz que conservan su nombre (se revalidan en cada visita)
+SIN_HASH = {".html", ".json", ".txt", ".xml", ".webmanifest", ".br", ".gz"}
+
+# Carpetas cuyo contenido ya lleva hash en el nombre (Vite, imágenes y fuentes)
+CARPETAS_CON_HASH = ("assets/", "img/", "fonts/")
+
+# Por debajo de este tamaño la compresión no compensa
+TAMANO_MINIMO = 256
+
+CON_HASH = re.compile(r"\.[0-9a-f]{8}\.\w+$")
+
+
+def huella(datos: bytes) -> str:
+    """Hash corto del contenido para nombres de archivo y ETags"""
+    return hashlib.sha256(datos).hexdigest()[:8]
+
+
+def renombrar_con_hash(destino: Path) -> dict[str, str]:
+    """Copia los archivos estáticos de la raíz con el hash en el nombre"""
+    renombrados = {}
+    for archivo in sorted(destino.iterdir()):
+        if not archivo.is_file() or archivo.suffix in SIN_HASH or CON_HASH.search(archivo.name):
+            continue
+        con_hash = archivo.with_name(
+            f"{archivo.stem}.{huella(archivo.read_bytes())}{archivo.suffix}"
+        )
+        # Se conserva el original para quien lo pida por su nombre fijo (/favicon.ico)
+        shutil.copy2(archivo, con_hash)
+        renombrados[f"/{archivo.name}"] = f"/{con_hash.name}"
+    return renombrados
+
+
+def reescribir_referencias(destino: Path, renombrados: dict[str, str]) -> None:
+    """Apunta el HTML a los nombres con hash; el JS de Vite ya usa nombres con hash"""
+    if not renombrados:
+        return
+    patron = re.compile(
+        r"(?<=[\"'(])("
+        + "|".join(re.escape(ruta) for ruta in sorted(renombrados, key=len, reverse=True))
+        + r")(?=[\"')?#])"
+    )
+    for html in destino.rglob("*.html"):
+        texto = html.read_text(encoding="utf-8")
+        nuevo = patron.sub(lambda m: renombrados[m.group(1)], texto)
+        if nuevo != texto:
+            html.write_text(nuevo, encoding="utf-8")
+
+
+def precomprimir(archivo: Path) -> None:
+    """Escribe los hermanos .br y .gz con el nivel máximo si reducen el tamaño"""
+    datos = archivo.read_bytes()
+    variantes = {
+        ".br": brotli.compress(datos, quality=11),
+        ".gz": gzip.compress(datos, compresslevel=9, mtime=0),
+    }
+    for sufijo, comprimido in variantes.items():
+        hermano = archivo.with_name(archivo.name + sufijo)
+        if len(comprimido) < len(datos):
+            hermano.write_bytes(comprimido)
+        else:
+            hermano.unlink(missing_ok=True)
+
+
+def comprimir(destino: Path) -> dict:
+    """Post-procesa el sitio exportado y escribe el manifiesto de caché"""
+    renombrados = renombrar_con_hash(destino)
+    reescribir_referencias(destino, renombrados)
+
+    for archivo in destino.rglob("*"):
+        if (
+            archivo.is_file()
+            and archivo.suffix in COMPRIMIBLES
+            and archivo.stat().st_size >= TAMANO_MINIMO
+        ):
+            precomprimir(archivo)
+
+    inmutables = set(renombrados.values())
+    for carpeta in CARPETAS_CON_HASH:
+        for archivo in (destino / carpeta).rglob("*"):
+            if archivo.is_file() and archivo.suffix not in {".br", ".gz"}:
+                inmutables.add("/" + archivo.relative_to(destino).as_posix())
+
+    manifiesto = {"renombrados": renombrados, "inmutables": sorted(inmutables)}
+    (destino / MANIFIESTO).write_text(json.dumps(manifiesto, indent=2), encoding="utf-8")
+    return manifiesto
+
+
+if __name__ == "__main__":
+    resultado = comprimir(Path(sys.argv[1]) if len(sys.argv) > 1 else DIST_DIR)
+    print(f"{len(resultado['inmutables'])} archivos con caché inmutable")
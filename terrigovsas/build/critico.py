@@ -0,0 +1,267 @@
+"""Etapa de CSS crítico: reglas del primer pintado en línea, la hoja completa en diferido.
+
+Corre antes de la compresión. Por cada página exportada:
+- toma el marcado por encima del pliegue: todo lo anterior a la primera
+  sección `bajo_el_pliegue` (en `/`, navbar y hero), o la página entera si
+  no tiene ninguna;
+- de cada hoja local enlazada conserva solo las reglas cuyos selectores
+  pueden aplicar a ese marcado (etiquetas, clases, ids y atributos
+  presentes), dentro de sus @media/@supports;
+- descarta las propiedades personalizadas que nada usa (las escalas de
+  color de Radix que no son de la paleta) y las @keyframes sin animación;
+- inserta el resultado en un `<style>` donde estaba el `<link>` y deja el
+  `<link>` como `media="print"` con `onload` a `all`: se descarga sin
+  bloquear el pintado y sigue siendo el mismo elemento para la hidratación
+  de React Router.
+
+La selección es conservadora: ante la duda (pseudoclases, `:is()`,
+combinadores) una regla se incluye. La hoja completa, al llegar, vuelve a
+declarar las mismas reglas en el mismo orden.
+"""
+
+import re
+import sys
+from html.parser import HTMLParser
+from pathlib import Path
+
+from terrigovsas.build.export import DIST_DIR
+
+# Primer contenedor de `terrigovsas.diferido.bajo_el_pliegue` en el HTML
+PLIEGUE = re.compile(r'<[^>]*\bid="diferida-')
+
+# Reglas @ que agrupan reglas de estilo y se filtran por dentro
+AGRUPADORAS = {"media", "supports", "layer", "container", "document"}
+# Reglas @ que se conservan tal cual (`@layer a, b;` fija el orden de las capas);
+# @charset se descarta: solo vale al principio de una hoja y el HTML ya es UTF-8
+SIEMPRE = {"font-face", "property", "layer", "namespace"}
+
+_ARROBA = re.compile(r"@(-?[\w-]+)")
+_HOJA = re.compile(r'<link\b[^>]*\brel="stylesheet"[^>]*>')
+_HREF = re.compile(r'\bhref="(/[^/"][^"]*)"')
+_COMENTARIO = re.compile(r"/\*.*?\*/", re.DOTALL)
+_PARENTESIS = re.compile(r"(?<!\\)\([^()]*(?<!\\)\)")
+_TOKEN = re.compile(r"\[\s*([\w-]+)[^\]]*\]|::?(?:\\.|[\w-])+|([.#]?)((?:\\.|[\w-])+)|.", re.DOTALL)
+_ESCAPE = re.compile(r"\\(.)")
+_VAR = re.compile(r"var\(\s*(--[\w-]+)")
+
+
+class Marcado(HTMLParser):
+    """Etiquetas, clases, ids y atributos presentes en un fragmento de HTML"""
+
+    def __init__(self):
+        super().__init__()
+        self.presentes: set[tuple[str, str]] = set()
+
+    def handle_starttag(self, tag, attrs):
+        self.presentes.add(("", tag))
+        for nombre, valor in attrs:
+            self.presentes.add(("[", nombre))
+            if nombre == "class" and valor:
+                self.presentes.update((".", clase) for clase in valor.split())
+            elif nombre == "id" and valor:
+                self.presentes.add(("#", valor))
+
+    handle_startendtag = handle_starttag
+
+
+def bloques(css: str) -> list[tuple[str, str | None]]:
+    """(preludio, cuerpo) de cada regla de primer nivel; cuerpo None en sentencias como @charset"""
+    resultado, inicio, apertura, profundidad, i = [], 0, 0, 0, 0
+    while i < len(css):
+        caracter = css[i]
+        if caracter in "\"'":
+            fin = i + 1
+            while fin < len(css) and css[fin] != caracter:
+                fin += 2 if css[fin] == "\\" else 1
+            i = fin + 1
+            continue
+        if css.startswith("/*", i):
+            fin = css.find("*/", i + 2)
+            i = len(css) if fin < 0 else fin + 2
+            continue
+        if caracter == "{":
+            if profundidad == 0:
+                apertura = i
+            profundidad += 1
+        elif caracter == "}":
+            profundidad -= 1
+            if profundidad == 0:
+                resultado.append((_COMENTARIO.sub("", css[inicio:apertura]).strip(), css[apertura + 1:i]))
+                inicio = i + 1
+        elif caracter == ";" and profundidad == 0:
+            resultado.append((_COMENTARIO.sub("", css[inicio:i]).strip(), None))
+            inicio = i + 1
+        i += 1
+    return resultado
+
+
+def partir(texto: str, separador: str) -> list[str]:
+    """Divide por `separador` fuera de paréntesis, corchetes y comillas"""
+    partes, actual, profundidad, comilla = [], [], 0, None
+    for caracter in texto:
+        if comilla:
+            comilla = None if caracter == comilla else comilla
+        elif caracter in "\"'":
+            comilla = caracter
+        elif caracter in "([":
+            profundidad += 1
+        elif caracter in ")]":
+            profundidad -= 1
+        elif caracter == separador and profundidad == 0:
+            partes.append("".join(actual))
+            actual = []
+            continue
+        actual.append(caracter)
+    partes.append("".join(actual))
+    return [parte.strip() for parte in partes if parte.strip()]
+
+
+def aplica(selector: str, presentes: set[tuple[str, str]]) -> bool:
+    """Si todas las etiquetas, clases, ids y atributos que exige el selector están presentes"""
+    # Lo que va entre paréntesis (:not, :is, :nth-child...) no se exige
+    anterior = None
+    while anterior != selector:
+        anterior, selector = selector, _PARENTESIS.sub("", selector)
+    for coincidencia in _TOKEN.finditer(selector):
+        atributo, prefijo, nombre = coincidencia.groups()
+        if atributo:
+            requisito = ("[", atributo.lower())
+        elif nombre:
+            nombre = _ESCAPE.sub(r"\1", nombre)
+            requisito = (prefijo, nombre.lower() if not prefijo else nombre)
+        else:
+            # Pseudoclases, combinadores, `*` y espacios
+            continue
+        if requisito not in presentes:
+            return False
+    return True
+
+
+def _tipo(preludio: str) -> str | None:
+    """Nombre de la regla @ (`media`, `font-face`...) o None si es una regla de estilo"""
+    return coincidencia.group(1).lower() if (coincidencia := _ARROBA.match(preludio)) else None
+
+
+def filtrar(css: str, presentes: set[tuple[str, str]]) -> list[tuple]:
+    """Reglas que pueden aplicar al marcado; las agrupadoras llevan una lista de reglas"""
+    reglas = []
+    for preludio, cuerpo in bloques(css):
+        tipo = _tipo(preludio)
+        if tipo is None:
+            selectores = [s for s in partir(preludio, ",") if cuerpo is not None and aplica(s, presentes)]
+            if selectores:
+                reglas.append((",".join(selectores), cuerpo))
+        elif tipo in AGRUPADORAS and cuerpo is not None:
+            if internas := filtrar(cuerpo, presentes):
+                reglas.append((preludio, internas))
+        elif tipo in SIEMPRE or tipo.endswith("keyframes"):
+            reglas.append((preludio, cuerpo))
+    return reglas
+
+
+def _declaraciones(reglas: list[tuple]):
+    for preludio, cuerpo in reglas:
+        if isinstance(cuerpo, list):
+            yield from _declaraciones(cuerpo)
+        elif cuerpo is not None and not preludio.startswith("@"):
+            for declaracion in partir(cuerpo, ";"):
+                nombre, _, valor = declaracion.partition(":")
+                yield nombre.strip(), valor
+
+
+def variables_usadas(reglas: list[tuple], externas: set[str]) -> set[str]:
+    """Propiedades personalizadas referenciadas, directa o transitivamente"""
+    declaradas: dict[str, list[str]] = {}
+    usadas = set(externas)
+    for nombre, valor in _declaraciones(reglas):
+        if nombre.startswith("--"):
+            declaradas.setdefault(nombre, []).append(valor)
+        else:
+            usadas.update(_VAR.findall(valor))
+    pendientes = list(usadas)
+    while pendientes:
+        for valor in declaradas.get(pendientes.pop(), ()):
+            for nueva in _VAR.findall(valor):
+                if nueva not in usadas:
+                    usadas.add(nueva)
+                    pendientes.append(nueva)
+    return usadas
+
+
+def serializar(reglas: list[tuple], usadas: set[str]) -> str:
+    """CSS de las reglas, sin las propiedades personalizadas que no se usan"""
+    salida = []
+    for preludio, cuerpo in reglas:
+        if cuerpo is None:
+            salida.append(f"{preludio};")
+        elif isinstance(cuerpo, list):
+            if interno := serializar(cuerpo, usadas):
+                salida.append(f"{preludio}{{{interno}}}")
+        elif preludio.startswith("@"):
+            salida.append(f"{preludio}{{{cuerpo}}}")
+        else:
+            declaraciones = [
+                d for d in partir(cuerpo, ";") if not d.startswith("--") or d.partition(":")[0].strip() in usadas
+            ]
+            if declaraciones:
+                salida.append(f"{preludio}{{{';'.join(declaraciones)}}}")
+    return "".join(salida)
+
+
+def critico(css: str, html: str) -> str:
+    """CSS mínimo para pintar el marcado por encima del pliegue de `html`"""
+    pliegue = PLIEGUE.search(html)
+    marcado = Marcado()
+    marcado.feed(html[: pliegue.start()] if pliegue else html)
+    reglas = filtrar(css, marcado.presentes)
+    # Estilos en línea y <style> de la página también usan variables de la hoja
+    usadas = variables_usadas(reglas, set(_VAR.findall(html)))
+    animaciones = [r for r in reglas if (_tipo(r[0]) or "").endswith("keyframes")]
+    resto = serializar([r for r in reglas if r not in animaciones], usadas)
+    # Solo las @keyframes que nombra alguna regla conservada
+    usadas_por_resto = [
+        r for r in animaciones
+        if re.search(rf"(?<![\w-]){re.escape(r[0].split(None, 1)[-1].strip())}(?![\w-])", resto)
+    ]
+    return resto + serializar(usadas_por_resto, usadas)
+
+
+def inlinear(pagina: Path, destino: Path) -> int | None:
+    """Pone en línea el CSS crítico de una página y difiere sus hojas; bytes en línea"""
+    texto = pagina.read_text(encoding="utf-8")
+    if "data-critico" in texto:
+        return None
+    hojas = [
+        (enlace, destino / href.group(1).split("?")[0].lstrip("/"))
+        for enlace in _HOJA.findall(texto)
+        if "media=" not in enlace and (href := _HREF.search(enlace))
+    ]
+    hojas = [(enlace, archivo) for enlace, archivo in hojas if archivo.is_file()]
+    if not hojas:
+        return None
+
+    css = "".join(critico(archivo.read_text(encoding="utf-8"), texto) for _, archivo in hojas)
+    # `\/` es un escape válido en CSS y evita cerrar el <style> antes de tiempo
+    css = css.replace("</style", "<\\/style")
+    # data-precedence: React no lo confunde con los <style> que hidrata en el <head>
+    estilo = f'<style data-critico data-precedence="critico">{css}</style>'
+    for indice, (enlace, _) in enumerate(hojas):
+        diferido = enlace.replace("<link", "<link media=\"print\" onload=\"this.media='all'\"", 1)
+        sin_js = f"<noscript>{enlace}</noscript>"
+        texto = texto.replace(enlace, (estilo if indice == 0 else "") + diferido + sin_js, 1)
+    pagina.write_text(texto, encoding="utf-8")
+    return len(css.encode())
+
+
+def generar(destino: Path) -> dict[str, int]:
+    """Inlinea el CSS crítico en cada página exportada"""
+    tamanos = {}
+    for pagina in sorted(destino.rglob("*.html")):
+        if (tamano := inlinear(pagina, destino)) is not None:
+            tamanos["/" + pagina.relative_to(destino).as_posix()] = tamano
+    return tamanos
+
+
+if __name__ == "__main__":
+    for ruta, tamano in generar(Path(sys.argv[1]) if len(sys.argv) > 1 else DIST_DIR).items():
+        print(f"{ruta}: {tamano / 1024:.1f} KiB de CSS crítico en línea")
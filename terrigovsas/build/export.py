@@ -0,0 +1,91 @@
+"""Exportación estática de la landing.
+
+Prerenderiza las páginas a HTML/JS/CSS. Las páginas sin estado se sirven
+como archivos estáticos; las que usan rx.State (el formulario de contacto)
+necesitan además el backend, que `terrigovsas.servidor` atiende en el mismo
+puerto. Antes de compilar se comprueba que ninguna página use estado sin
+haberlo declarado con `context={"conexion": "diferida" | "inmediata"}`
+(ver `terrigovsas.conexion`): un estado añadido por descuido haría que cada
+visitante abriera el websocket al cargar.
+"""
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from reflex import constants
+from reflex.app import App
+from reflex.compiler.compiler import into_component
+from reflex.components.component import Component
+
+from terrigovsas.conexion import DIFERIDA, INMEDIATA
+
+# Carpeta de salida del sitio estático
+DIST_DIR = Path("dist")
+
+
+# Modos de `terrigovsas.conexion` que declaran que una página necesita el backend
+CON_BACKEND = (DIFERIDA, INMEDIATA)
+
+
+class PaginaConEstadoError(RuntimeError):
+    """Una página usa estado o eventos y no puede exportarse como estática"""
+
+
+def usa_estado(componente: Component) -> bool:
+    """Indica si el árbol de componentes depende de rx.State o de eventos"""
+    if componente._has_stateful_event_triggers():
+        return True
+    for var in componente._get_vars(include_children=True):
+        var_data = var._get_all_var_data()
+        if var_data and var_data.state:
+            return True
+    return False
+
+
+def verificar_estado(app: App, sin_estado: bool = False) -> None:
+    """Falla si alguna página usa estado, on_load o eventos sin declararlo.
+
+    Con `sin_estado` ninguna página puede usarlos, aunque lo declare.
+    """
+    for ruta, pagina in app._unevaluated_pages.items():
+        if pagina.on_load:
+            motivo = "define on_load"
+        elif usa_estado(into_component(pagina.component)):
+            motivo = "usa estado o manejadores de eventos"
+        else:
+            continue
+        if sin_estado:
+            raise PaginaConEstadoError(f"La página '{ruta}' {motivo}")
+        if pagina.context.get("conexion") not in CON_BACKEND:
+            raise PaginaConEstadoError(
+                f"La página '{ruta}' {motivo} sin declarar que necesita el backend: "
+                f"quita el estado o añade context={{\"conexion\": \"diferida\"}} (o \"inmediata\")"
+            )
+
+
+def exportar(destino: Path = DIST_DIR, sin_estado: bool = False) -> Path:
+    """Compila el frontend en modo producción y lo copia a `destino`.
+
+    Falla antes de compilar si alguna página usa estado sin declararlo; con
+    `sin_estado`, si alguna lo usa (para servir el sitio desde un hosting
+    puramente estático).
+    """
+    from terrigovsas.terrigovsas import app
+
+    verificar_estado(app, sin_estado)
+
+    subprocess.run(
+        ["reflex", "export", "--frontend-only", "--no-zip", "--env", "prod"],
+        check=True,
+    )
+
+    shutil.rmtree(destino, ignore_errors=True)
+    shutil.copytree(Path(constants.Dirs.WEB) / constants.Dirs.STATIC, destino)
+    return destino
+
+
+if __name__ == "__main__":
+    salida = exportar(Path(sys.argv[1]) if len(sys.argv) > 1 else DIST_DIR)
+    print(f"Sitio estático exportado en {salida}/")
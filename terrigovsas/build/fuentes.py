@@ -0,0 +1,101 @@
+"""Etapa de fuentes: Inter subconjuntada a los glifos de la página, en WOFF2"""
+
+import io
+import json
+import zipfile
+from pathlib import Path
+
+import httpx
+from fontTools import subset
+from fontTools.ttLib import TTFont
+from fontTools.varLib import instancer
+
+from terrigovsas.build.compresion import huella
+from terrigovsas.fuentes import FUENTES_DIR, MANIFIESTO
+
+ORIGEN = "https://github.com/rsms/inter/releases/download/v4.1/Inter-4.1.zip"
+ARCHIVO_EN_ZIP = "InterVariable.ttf"
+CACHE_DIR = Path(".cache") / "fuentes"
+
+# Latín básico, letras y signos del español y tipografía habitual
+BASE = "".join(chr(c) for c in range(0x20, 0x7F)) + "áéíóúüñÁÉÍÓÚÜÑ¿¡«»“”‘’–—…©®°·€"
+
+# Rango de pesos que usa la página (normal, medium, bold)
+PESOS = (400, 700)
+
+
+def ruta_original() -> Path:
+    """TTF variable de Inter, descargado una sola vez"""
+    ruta = CACHE_DIR / ARCHIVO_EN_ZIP
+    if not ruta.exists():
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        respuesta = httpx.get(ORIGEN, follow_redirects=True, timeout=60)
+        respuesta.raise_for_status()
+        with zipfile.ZipFile(io.BytesIO(respuesta.content)) as zf:
+            nombre = next(n for n in zf.namelist() if n.endswith(ARCHIVO_EN_ZIP))
+            ruta.write_bytes(zf.read(nombre))
+    return ruta
+
+
+def texto_de_la_pagina() -> str:
+    """Caracteres presentes en el árbol renderizado de la página"""
+    from terrigovsas.terrigovsas import index
+
+    return json.dumps(index().render(), ensure_ascii=False)
+
+
+def rango_unicode(caracteres: set[str]) -> str:
+    """Compacta los puntos de código en rangos para unicode-range"""
+    puntos = sorted(ord(c) for c in caracteres)
+    rangos, inicio = [], puntos[0]
+    for anterior, actual in zip(puntos, [*puntos[1:], None]):
+        if actual != anterior + 1:
+            rangos.append(f"U+{inicio:X}" if inicio == anterior else f"U+{inicio:X}-{anterior:X}")
+            inicio = actual
+    return ",".join(rangos)
+
+
+def generar() -> dict:
+    """Subconjunta la fuente, la escribe con hash en assets/fonts/ y su manifiesto"""
+    caracteres = {c for c in BASE + texto_de_la_pagina() if c.isprintable()}
+
+    fuente = TTFont(ruta_original())
+    if "fvar" in fuente:
+        ejes = {eje.axisTag for eje in fuente["fvar"].axes}
+        limites = {"wght": PESOS} if "wght" in ejes else {}
+        # El tamaño óptico se fija a su valor por defecto
+        limites.update({eje: None for eje in ejes - {"wght"}})
+        fuente = instancer.instantiateVariableFont(fuente, limites)
+
+    opciones = subset.Options()
+    opciones.flavor = "woff2"
+    opciones.hinting = False
+    opciones.desubroutinize = True
+    opciones.layout_features = ["kern", "liga", "calt", "ccmp", "locl", "mark", "mkmk"]
+    subconjuntador = subset.Subsetter(opciones)
+    subconjuntador.populate(text="".join(caracteres))
+    subconjuntador.subset(fuente)
+
+    buffer = io.BytesIO()
+    fuente.flavor = "woff2"
+    fuente.save(buffer)
+    datos = buffer.getvalue()
+
+    FUENTES_DIR.mkdir(parents=True, exist_ok=True)
+    for anterior in FUENTES_DIR.glob("inter-*.woff2"):
+        anterior.unlink()
+    archivo = FUENTES_DIR / f"inter-{huella(datos)}.woff2"
+    archivo.write_bytes(datos)
+
+    meta = {
+        "archivo": f"/fonts/{archivo.name}",
+        "pesos": f"{PESOS[0]} {PESOS[1]}" if "fvar" in fuente else "400",
+        "unicode_range": rango_unicode(caracteres),
+    }
+    MANIFIESTO.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return meta
+
+
+if __name__ == "__main__":
+    meta = generar()
+    print(f"{meta['archivo']} ({meta['unicode_range']})")
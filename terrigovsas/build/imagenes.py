@@ -0,0 +1,93 @@
+"""Etapa de imágenes: variantes AVIF/WebP por breakpoint en assets/img/"""
+
+import io
+import json
+from pathlib import Path
+
+import httpx
+from PIL import Image
+
+from terrigovsas.build.compresion import huella
+from terrigovsas.imagenes import ASSETS_DIR, DENSIDADES, IMAGENES, IMG_DIR, MANIFIESTO
+
+# Originales remotos descargados una sola vez
+CACHE_DIR = Path(".cache") / "imagenes"
+
+# Opciones de codificación por formato
+FORMATOS = {
+    "avif": {"quality": 50, "speed": 4},
+    "webp": {"quality": 80, "method": 6},
+}
+
+
+def ruta_original(origen: str) -> Path:
+    """Devuelve la ruta local del original, descargándolo si es remoto"""
+    if not origen.startswith(("http://", "https://")):
+        return ASSETS_DIR / origen
+    ruta = CACHE_DIR / origen.rsplit("/", 1)[-1]
+    if not ruta.exists():
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        respuesta = httpx.get(origen, follow_redirects=True, timeout=30)
+        respuesta.raise_for_status()
+        ruta.write_bytes(respuesta.content)
+    return ruta
+
+
+def anchos_variantes(anchos_css: dict, ancho_original: int) -> list[int]:
+    """Anchos en píxeles a generar: cada breakpoint por cada densidad"""
+    return sorted(
+        {min(ancho * d, ancho_original) for ancho in anchos_css.values() for d in DENSIDADES}
+    )
+
+
+def codificar(nombre: str, original: Image.Image, anchos_css: dict) -> dict:
+    """Redimensiona y codifica una imagen; los nombres llevan el hash del contenido"""
+    variantes = {formato: [] for formato in FORMATOS}
+    for ancho in anchos_variantes(anchos_css, original.width):
+        alto = round(original.height * ancho / original.width)
+        redimensionada = original.resize((ancho, alto), Image.LANCZOS)
+        for formato, opciones in FORMATOS.items():
+            buffer = io.BytesIO()
+            redimensionada.save(buffer, formato.upper(), **opciones)
+            datos = buffer.getvalue()
+            archivo = IMG_DIR / f"{nombre}-{ancho}w.{huella(datos)}.{formato}"
+            archivo.write_bytes(datos)
+            variantes[formato].append([ancho, f"/img/{archivo.name}"])
+    # Dimensiones intrínsecas de la variante mayor, para reservar el espacio
+    return {"ancho": ancho, "alto": alto, "variantes": variantes}
+
+
+def generar() -> dict:
+    """Genera las variantes de todas las imágenes y escribe el manifiesto"""
+    IMG_DIR.mkdir(parents=True, exist_ok=True)
+    previo = json.loads(MANIFIESTO.read_text(encoding="utf-8")) if MANIFIESTO.exists() else {}
+    manifiesto = {}
+    for nombre, conf in IMAGENES.items():
+        ruta = ruta_original(conf["origen"])
+        firma = huella(ruta.read_bytes() + json.dumps([conf["anchos"], FORMATOS]).encode())
+        # Solo se recodifica si cambió el original, los anchos o las opciones
+        if previo.get(nombre, {}).get("firma") == firma:
+            manifiesto[nombre] = previo[nombre]
+            continue
+        with Image.open(ruta) as original:
+            original.load()
+        manifiesto[nombre] = {**codificar(nombre, original, conf["anchos"]), "firma": firma}
+
+    # Elimina variantes de versiones anteriores
+    vigentes = {
+        ruta.rsplit("/", 1)[-1]
+        for meta in manifiesto.values()
+        for variantes in meta["variantes"].values()
+        for _, ruta in variantes
+    }
+    for archivo in IMG_DIR.iterdir():
+        if archivo != MANIFIESTO and archivo.name not in vigentes:
+            archivo.unlink()
+
+    MANIFIESTO.write_text(json.dumps(manifiesto, indent=2), encoding="utf-8")
+    return manifiesto
+
+
+if __name__ == "__main__":
+    for nombre, meta in generar().items():
+        print(f"{nombre}: {len(meta['variantes']['webp'])} anchos")
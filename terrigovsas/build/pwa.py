@@ -0,0 +1,223 @@
+"""Etapa PWA (opcional): manifiesto web, service worker y página sin conexión.
+
+Se activa con TERRIGOV_PWA=1 y corre después de la compresión, porque usa
+el manifiesto de caché para saber qué archivos llevan hash. El service worker:
+- precachea el bundle, las fuentes y los archivos renombrados con hash, más
+  `/` y `/offline.html`;
+- sirve desde caché solo los archivos con hash y las imágenes (nunca
+  cambian); `/` y `/offline.html` se precachean pero no son inmutables;
+- sirve el HTML con stale-while-revalidate;
+- sin red y sin copia de la página, muestra `/offline.html` con los datos
+  de contacto;
+- borra las cachés de versiones anteriores al activarse.
+"""
+
+import html
+import json
+import os
+import sys
+from pathlib import Path
+
+from PIL import Image
+
+from terrigovsas.build.compresion import huella, precomprimir
+from terrigovsas.build.export import DIST_DIR
+from terrigovsas.contenido import contenido
+from terrigovsas.estaticos import MANIFIESTO
+
+ACTIVADO = os.environ.get("TERRIGOV_PWA") == "1"
+
+LOGO = Path("assets") / "logo.png"
+# Tamaños de icono que piden los navegadores para instalar la app
+TAMANOS_ICONO = (192, 512)
+
+# Lo que se precachea al instalar, además de `/` y la página sin conexión
+CARPETAS_PRECACHE = ("/assets/", "/fonts/")
+# Lo que se cachea al primer uso (variantes de imagen: no se baja cada ancho)
+CARPETAS_AL_USO = ("/img/",)
+
+SERVICE_WORKER = """\
+// Generado por terrigovsas.build.pwa
+const VERSION = "terrigov-__VERSION__";
+// Solo archivos con hash: se sirven desde caché sin volver a la red
+const INMUTABLES = new Set(__INMUTABLES__);
+const AL_USO = __AL_USO__;
+const SIN_CONEXION = "/offline.html";
+// `/` y la página sin conexión se precachean pero no son inmutables
+const PRECACHE = ["/", SIN_CONEXION, ...INMUTABLES];
+
+self.addEventListener("install", (evento) => {
+  evento.waitUntil(
+    caches.open(VERSION).then((cache) => cache.addAll(PRECACHE)).then(() => self.skipWaiting()),
+  );
+});
+
+self.addEventListener("activate", (evento) => {
+  evento.waitUntil(
+    caches.keys()
+      .then((nombres) => Promise.all(
+        nombres.filter((n) => n.startsWith("terrigov-") && n !== VERSION).map((n) => caches.delete(n)),
+      ))
+      .then(() => self.clients.claim()),
+  );
+});
+
+const desdeCache = async (peticion) => {
+  const cache = await caches.open(VERSION);
+  const guardada = await cache.match(peticion);
+  if (guardada) return guardada;
+  const respuesta = await fetch(peticion);
+  if (respuesta.ok) cache.put(peticion, respuesta.clone());
+  return respuesta;
+};
+
+const paginaConRevalidacion = async (evento, ruta) => {
+  const cache = await caches.open(VERSION);
+  const guardada = await cache.match(ruta);
+  const red = fetch(evento.request).then((respuesta) => {
+    if (respuesta.ok) cache.put(ruta, respuesta.clone());
+    return respuesta;
+  });
+  if (guardada) {
+    evento.waitUntil(red.catch(() => {}));
+    return guardada;
+  }
+  return red.catch(async () => (await cache.match(SIN_CONEXION)) || Response.error());
+};
+
+self.addEventListener("fetch", (evento) => {
+  const peticion = evento.request;
+  const url = new URL(peticion.url);
+  // Backend (eventos, analítica, métricas) y otros orígenes van directo a la red
+  if (peticion.method !== "GET" || url.origin !== self.location.origin) return;
+  if (peticion.mode === "navigate") {
+    evento.respondWith(paginaConRevalidacion(evento, url.pathname));
+  } else if (INMUTABLES.has(url.pathname) || AL_USO.some((c) => url.pathname.startsWith(c))) {
+    evento.respondWith(desdeCache(peticion));
+  }
+});
+"""
+
+REGISTRO = (
+    '<script>if("serviceWorker"in navigator)addEventListener("load",()=>'
+    'navigator.serviceWorker.register("/sw.js"))</script>'
+)
+
+
+def iconos(destino: Path, renombrados: dict[str, str]) -> list[dict]:
+    """Favicon y versiones cuadradas del logo para el manifiesto"""
+    favicon = renombrados.get("/favicon.ico", "/favicon.ico")
+    with Image.open(destino / favicon.lstrip("/")) as ico:
+        tamanos = " ".join(f"{ancho}x{alto}" for ancho, alto in sorted(ico.info.get("sizes", {ico.size})))
+    lista = [{"src": favicon, "sizes": tamanos, "type": "image/x-icon"}]
+
+    carpeta = destino / "img"
+    carpeta.mkdir(exist_ok=True)
+    with Image.open(LOGO) as original:
+        logo = original.convert("RGBA")
+    lado = max(logo.size)
+    cuadrado = Image.new("RGBA", (lado, lado), (0, 0, 0, 0))
+    cuadrado.paste(logo, ((lado - logo.width) // 2, (lado - logo.height) // 2))
+    for tamano in TAMANOS_ICONO:
+        temporal = carpeta / f"icono-{tamano}.png"
+        cuadrado.resize((tamano, tamano), Image.LANCZOS).save(temporal, optimize=True)
+        final = temporal.with_name(f"icono-{tamano}.{huella(temporal.read_bytes())}.png")
+        temporal.replace(final)
+        lista.append({"src": f"/img/{final.name}", "sizes": f"{tamano}x{tamano}", "type": "image/png"})
+    return lista
+
+
+def pagina_sin_conexion(colores: dict[str, str]) -> str:
+    """HTML autocontenido con los datos de contacto del modelo de contenido"""
+    contacto = contenido().contacto
+    e = html.escape
+    return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>TerriGov S.A.S. · Sin conexión</title>
+<style>
+body{{margin:0;font-family:system-ui,sans-serif;background:{colores["dark"]};color:{colores["light"]};
+display:flex;min-height:100vh;align-items:center;justify-content:center;text-align:center}}
+main{{padding:2rem;max-width:32rem}}a{{color:{colores["accent"]}}}p{{line-height:1.6}}
+</style>
+</head>
+<body>
+<main>
+<h1>TerriGov S.A.S.</h1>
+<p>No hay conexión en este momento. Puedes contactarnos por:</p>
+<p>Email: <a href="mailto:{e(contacto.email)}">{e(contacto.email)}</a><br>
+Teléfono: <a href="tel:{e(contacto.telefono.replace(" ", ""))}">{e(contacto.telefono)}</a><br>
+WhatsApp: <a href="{e(contacto.whatsapp)}">{e(contacto.telefono)}</a><br>
+{e(contacto.ubicacion)}</p>
+</main>
+</body>
+</html>
+"""
+
+
+def inyectar(pagina: Path, colores: dict[str, str]) -> None:
+    """Enlaza el manifiesto y registra el service worker en una página"""
+    texto = pagina.read_text(encoding="utf-8")
+    if 'rel="manifest"' in texto:
+        return
+    cabecera = f'<link rel="manifest" href="/manifest.webmanifest"><meta name="theme-color" content="{colores["primary"]}">'
+    texto = texto.replace("</head>", cabecera + "</head>", 1).replace("</body>", REGISTRO + "</body>", 1)
+    pagina.write_text(texto, encoding="utf-8")
+    precomprimir(pagina)
+
+
+def generar(destino: Path) -> dict:
+    """Escribe manifest.webmanifest, sw.js y offline.html y los enlaza en el HTML"""
+    from terrigovsas.terrigovsas import colors
+
+    manifiesto_cache = json.loads((destino / MANIFIESTO).read_text(encoding="utf-8"))
+    renombrados = manifiesto_cache["renombrados"]
+
+    manifiesto = {
+        "name": "TerriGov S.A.S.",
+        "short_name": "TerriGov",
+        "lang": "es",
+        "start_url": "/",
+        "scope": "/",
+        "display": "standalone",
+        "background_color": colors["light"],
+        "theme_color": colors["primary"],
+        "icons": iconos(destino, renombrados),
+    }
+    # Los iconos generados llevan hash: caché inmutable como el resto de img/
+    manifiesto_cache["inmutables"] = sorted({
+        *manifiesto_cache["inmutables"], *(i["src"] for i in manifiesto["icons"] if i["src"].startswith("/img/")),
+    })
+    (destino / MANIFIESTO).write_text(json.dumps(manifiesto_cache, indent=2), encoding="utf-8")
+    precomprimir(destino / MANIFIESTO)
+    (destino / "manifest.webmanifest").write_text(json.dumps(manifiesto, ensure_ascii=False), encoding="utf-8")
+
+    sin_conexion = pagina_sin_conexion(colors)
+    (destino / "offline.html").write_text(sin_conexion, encoding="utf-8")
+
+    precache = sorted(
+        ruta for ruta in manifiesto_cache["inmutables"]
+        if ruta.startswith(CARPETAS_PRECACHE) or ruta in renombrados.values()
+    )
+    # La versión cambia cuando cambia lo precacheado; el HTML se revalida solo
+    version = huella(json.dumps([precache, sin_conexion]).encode())
+    sw = (
+        SERVICE_WORKER.replace("__VERSION__", version)
+        .replace("__INMUTABLES__", json.dumps(precache))
+        .replace("__AL_USO__", json.dumps(list(CARPETAS_AL_USO)))
+    )
+    (destino / "sw.js").write_text(sw, encoding="utf-8")
+
+    for pagina in destino.rglob("*.html"):
+        if pagina.name != "offline.html":
+            inyectar(pagina, colors)
+    for nombre in ("manifest.webmanifest", "sw.js", "offline.html"):
+        precomprimir(destino / nombre)
+    return {"version": version, "precache": len(precache) + 2}
+
+
+if __name__ == "__main__":
+    resultado = generar(Path(sys.argv[1]) if len(sys.argv) > 1 else DIST_DIR)
+    print(f"Service worker {resultado['version']}: {resultado['precache']} archivos precacheados")
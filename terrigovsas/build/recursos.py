@@ -0,0 +1,211 @@
+"""Validación de recursos referenciados y sugerencias de carga (preload/preconnect).
+
+Antes de compilar, `validar` busca en el código de la página y en el modelo de
+contenido las rutas locales a archivos (`'/logo.png'`, `url('/fondo.jpg')`) y
+falla si alguna no existe en assets/: cada una sería un 404 en cada visita.
+
+Después de la compresión, `sugerir` lee cada página exportada y:
+- añade `<link rel="preconnect">` para los orígenes externos de los que la
+  página carga recursos;
+- añade `<link rel="preload" as="image">` para la imagen LCP: la marcada con
+  `fetchpriority="high"` (`imagen_responsiva(..., prioritaria=True)`) o, sin
+  marca, la primera que no es diferida ni está en `<nav>`/`<header>` (logos);
+- guarda en el manifiesto de caché la cabecera `Link` de la página (CSS que
+  bloquea el pintado, fuente e imagen crítica), que el servidor envía con el
+  HTML y como 103 Early Hints si el servidor ASGI lo soporta. Las hojas
+  diferidas con `media="print"` (ver `critico`) no entran: precargarlas
+  competiría con el CSS en línea por el ancho de banda del primer pintado.
+"""
+
+import json
+import re
+import sys
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from terrigovsas.build.compresion import precomprimir
+from terrigovsas.build.export import DIST_DIR
+from terrigovsas.contenido import RUTA as CONTENIDO
+from terrigovsas.estaticos import MANIFIESTO
+from terrigovsas.imagenes import ASSETS_DIR
+
+PAQUETE = Path(__file__).resolve().parent.parent
+
+# Archivos que definen lo que la página referencia
+FUENTES = (PAQUETE / "terrigovsas.py", PAQUETE / "formulario.py", CONTENIDO)
+
+EXTENSIONES = "png|jpe?g|webp|avif|gif|svg|ico|woff2?|ttf|otf|css|js|mp4|webm|pdf"
+_LOCAL = re.compile(rf"""(?<=["'(])(/[\w./-]+\.(?:{EXTENSIONES}))(?=["')?#])""", re.IGNORECASE)
+_EXTERNA = re.compile(r"""https?://[^\s"'()<>]+""")
+
+
+class RecursoFaltanteError(FileNotFoundError):
+    """La página referencia un archivo local que no existe"""
+
+
+def referencias() -> dict[str, list[str]]:
+    """Rutas locales y URLs externas que aparecen en las fuentes de la página"""
+    locales, externas = {}, {}
+    for fuente in FUENTES:
+        texto = fuente.read_text(encoding="utf-8")
+        for numero, linea in enumerate(texto.splitlines(), 1):
+            ubicacion = f"{fuente.name}:{numero}"
+            for ruta in _LOCAL.findall(linea):
+                locales.setdefault(ruta, []).append(ubicacion)
+            for url in _EXTERNA.findall(linea):
+                externas.setdefault(url, []).append(ubicacion)
+    return {"locales": locales, "externas": externas}
+
+
+def validar() -> dict[str, list[str]]:
+    """Falla si alguna ruta local referenciada no existe en assets/"""
+    encontradas = referencias()
+    faltantes = [
+        f"{ruta} ({', '.join(ubicaciones)})"
+        for ruta, ubicaciones in encontradas["locales"].items()
+        if not (ASSETS_DIR / ruta.lstrip("/")).is_file()
+    ]
+    if faltantes:
+        raise RecursoFaltanteError(
+            "Recursos referenciados que no existen en assets/:\n  " + "\n  ".join(faltantes)
+        )
+    return encontradas
+
+
+class Criticos(HTMLParser):
+    """Recursos del camino crítico de una página exportada"""
+
+    def __init__(self):
+        super().__init__()
+        self.hojas: list[str] = []
+        self.fuentes: list[str] = []
+        self.precargadas: set[str] = set()
+        self.origenes: list[str] = []
+        self.conectados: set[str] = set()
+        self.imagen: dict[str, str] | None = None
+        self._picture: list[dict[str, str]] | None = None
+        # Lo que va en <noscript> repite recursos que ya están fuera
+        self._noscript = False
+        # Profundidad dentro de <nav>/<header>: sus imágenes (logos) no son el LCP
+        self._cabecera = 0
+        self._marcada = False
+
+    def _origen(self, url: str | None) -> None:
+        if url and url.startswith(("http://", "https://", "//")):
+            partes = urlsplit(url if not url.startswith("//") else "https:" + url)
+            origen = f"{partes.scheme}://{partes.netloc}"
+            if origen not in self.origenes:
+                self.origenes.append(origen)
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "noscript" or self._noscript:
+            self._noscript = True
+            return
+        if tag == "link":
+            rel = attrs.get("rel", "")
+            if rel == "preconnect":
+                self.conectados.add(attrs.get("href", ""))
+                return
+            self._origen(attrs.get("href"))
+            if rel == "stylesheet" and attrs.get("media") != "print":
+                self.hojas.append(attrs["href"])
+            elif rel == "preload":
+                self.precargadas.add(attrs.get("href") or attrs.get("imagesrcset", ""))
+                if attrs.get("as") == "font":
+                    self.fuentes.append(attrs["href"])
+        elif tag == "script":
+            self._origen(attrs.get("src"))
+        elif tag in ("nav", "header"):
+            self._cabecera += 1
+        elif tag == "picture":
+            self._picture = []
+        elif tag == "source" and self._picture is not None:
+            self._picture.append(attrs)
+        elif tag == "img":
+            self._origen(attrs.get("src"))
+            marcada = attrs.get("fetchpriority") == "high"
+            candidata = self.imagen is None and not self._cabecera and attrs.get("loading") != "lazy"
+            if attrs.get("src") and not self._marcada and (marcada or candidata):
+                self._marcada = marcada
+                # Con <picture> se precarga el primer formato, que es el que elige el navegador
+                fuente = (self._picture or [{}])[0]
+                self.imagen = {
+                    "src": attrs["src"],
+                    "srcset": fuente.get("srcset") or attrs.get("srcset", ""),
+                    "sizes": fuente.get("sizes") or attrs.get("sizes", ""),
+                    "type": fuente.get("type", ""),
+                }
+
+    def handle_endtag(self, tag):
+        if tag in ("nav", "header") and self._cabecera:
+            self._cabecera -= 1
+        elif tag == "picture":
+            self._picture = None
+        elif tag == "noscript":
+            self._noscript = False
+
+
+def _precarga_imagen(imagen: dict[str, str]) -> str:
+    atributos = f'rel="preload" as="image" href="{imagen["src"]}" fetchpriority="high"'
+    if imagen["srcset"]:
+        atributos += f' imagesrcset="{imagen["srcset"]}" imagesizes="{imagen["sizes"]}"'
+    if imagen["type"]:
+        atributos += f' type="{imagen["type"]}"'
+    return f"<link {atributos}>"
+
+
+def enlaces_criticos(criticos: Criticos) -> list[str]:
+    """Entradas de la cabecera Link con los recursos críticos locales de la página"""
+    enlaces = [f"<{hoja}>; rel=preload; as=style" for hoja in criticos.hojas if hoja.startswith("/")]
+    enlaces += [f"<{fuente}>; rel=preload; as=font; crossorigin" for fuente in criticos.fuentes]
+    if criticos.imagen and criticos.imagen["src"].startswith("/"):
+        imagen = criticos.imagen
+        enlace = f"<{imagen['src']}>; rel=preload; as=image"
+        if imagen["srcset"]:
+            enlace += f'; imagesrcset="{imagen["srcset"]}"; imagesizes="{imagen["sizes"]}"'
+        if imagen["type"]:
+            enlace += f'; type="{imagen["type"]}"'
+        enlaces.append(enlace)
+    return enlaces
+
+
+def sugerir(destino: Path) -> dict[str, list[str]]:
+    """Añade preconnect/preload a cada página y guarda su cabecera Link en el manifiesto"""
+    cabeceras = {}
+    for pagina in sorted(destino.rglob("*.html")):
+        texto = pagina.read_text(encoding="utf-8")
+        criticos = Criticos()
+        criticos.feed(texto)
+
+        sugerencias = [
+            f'<link rel="preconnect" href="{origen}" crossorigin>'
+            for origen in criticos.origenes
+            if origen not in criticos.conectados
+        ]
+        imagen = criticos.imagen
+        if imagen and imagen["src"] not in criticos.precargadas and imagen["srcset"] not in criticos.precargadas:
+            sugerencias.append(_precarga_imagen(imagen))
+        if sugerencias:
+            # Al principio del <head>, antes de que el navegador descubra el resto
+            texto = re.sub(r"<head[^>]*>", lambda m: m.group(0) + "".join(sugerencias), texto, count=1)
+            pagina.write_text(texto, encoding="utf-8")
+            precomprimir(pagina)
+
+        if enlaces := enlaces_criticos(criticos):
+            cabeceras["/" + pagina.relative_to(destino).as_posix()] = enlaces
+
+    manifiesto = json.loads((destino / MANIFIESTO).read_text(encoding="utf-8"))
+    manifiesto["enlaces"] = cabeceras
+    (destino / MANIFIESTO).write_text(json.dumps(manifiesto, indent=2), encoding="utf-8")
+    precomprimir(destino / MANIFIESTO)
+    return cabeceras
+
+
+if __name__ == "__main__":
+    encontradas = validar()
+    print(f"{len(encontradas['locales'])} recursos locales, {len(encontradas['externas'])} URLs externas")
+    if len(sys.argv) > 1 or DIST_DIR.exists():
+        for ruta, enlaces in sugerir(Path(sys.argv[1]) if len(sys.argv) > 1 else DIST_DIR).items():
+            print(f"{ruta}: Link: {', '.join(enlaces)}")
@@ -0,0 +1,112 @@
+"""Etapa del sprite de iconos: un único `<svg>` con los `<symbol>` usados.
+
+Corre antes de la compresión. Busca en el HTML y el JS exportados las
+referencias `#i-nombre` que genera `terrigovsas.iconos.icono`, toma la
+geometría de cada icono del paquete lucide-react ya instalado en el frontend
+(la misma versión que fija Reflex, sin red) e inserta el sprite, sin
+duplicados, al principio del `<body>` de cada página.
+"""
+
+import json
+import re
+import sys
+from html import escape
+from pathlib import Path
+
+import reflex as rx
+from reflex import constants
+
+from terrigovsas.build.export import DIST_DIR
+from terrigovsas.iconos import PREFIJO, PRESENTACION, normalizar
+
+LUCIDE = Path(constants.Dirs.WEB) / "node_modules" / "lucide-react" / "dist" / "esm"
+
+_REFERENCIA = re.compile(rf"#{PREFIJO}([a-z0-9-]+)")
+# export { default as BarChart3, default as ChartColumn, ... } from './icons/chart-column.js';
+_EXPORTACION = re.compile(r"export \{([^}]*)\} from '\./icons/([\w-]+)\.js'")
+_NODO = re.compile(r"__iconNode = (\[.*?\]);", re.DOTALL)
+_CLAVE = re.compile(r"([{,]\s*)([A-Za-z][\w-]*)\s*:")
+
+
+class GeometriaFaltanteError(LookupError):
+    """lucide-react no tiene la geometría de un icono usado"""
+
+
+def usados(destino: Path) -> list[str]:
+    """Iconos referenciados en las páginas y el bundle exportados"""
+    nombres = set()
+    for archivo in destino.rglob("*"):
+        if archivo.suffix in (".html", ".js"):
+            nombres.update(_REFERENCIA.findall(archivo.read_text(encoding="utf-8", errors="ignore")))
+    return sorted(nombres)
+
+
+def archivos(lucide: Path = LUCIDE) -> dict[str, str]:
+    """Nombre exportado por lucide-react (p. ej. BarChart3) → archivo de su geometría"""
+    indice = (lucide / "lucide-react.js").read_text(encoding="utf-8")
+    return {
+        alias.split(" as ")[-1].strip(): archivo
+        for exportados, archivo in _EXPORTACION.findall(indice)
+        for alias in exportados.split(",")
+        if " as " in alias
+    }
+
+
+def _kebab(nombre: str) -> str:
+    return re.sub(r"(?<!^)([A-Z])", r"-\1", nombre).lower()
+
+
+def geometria(archivo: Path) -> str:
+    """Elementos SVG de un icono a partir de su `__iconNode`"""
+    coincidencia = _NODO.search(archivo.read_text(encoding="utf-8"))
+    if coincidencia is None:
+        raise GeometriaFaltanteError(f"{archivo} no define __iconNode")
+    # Literal de JS a JSON: claves sin comillas y sin coma final
+    literal = _CLAVE.sub(r'\1"\2":', coincidencia.group(1))
+    elementos = json.loads(re.sub(r",\s*([\]}])", r"\1", literal))
+    return "".join(
+        f"<{etiqueta} "
+        + " ".join(f'{_kebab(nombre)}="{escape(str(valor))}"' for nombre, valor in atributos.items() if nombre != "key")
+        + "/>"
+        for etiqueta, atributos in elementos
+    )
+
+
+def sprite(nombres: list[str], lucide: Path = LUCIDE) -> str:
+    """`<svg>` oculto con un `<symbol>` por icono"""
+    indice = archivos(lucide)
+    simbolos = []
+    presentacion = " ".join(f'{nombre}="{valor}"' for nombre, valor in PRESENTACION.items())
+    for nombre in nombres:
+        # El mismo nombre de componente que usaría rx.icon
+        componente = rx.icon(normalizar(nombre)).tag
+        if componente not in indice:
+            raise GeometriaFaltanteError(f"lucide-react no exporta {componente} (icono '{nombre}')")
+        cuerpo = geometria(lucide / "icons" / f"{indice[componente]}.js")
+        simbolos.append(f'<symbol id="{PREFIJO}{nombre}" viewBox="0 0 24 24" {presentacion}>{cuerpo}</symbol>')
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" style="display:none" aria-hidden="true">'
+        + "".join(simbolos)
+        + "</svg>"
+    )
+
+
+def generar(destino: Path) -> list[str]:
+    """Inserta el sprite de los iconos usados en cada página exportada"""
+    nombres = usados(destino)
+    if not nombres:
+        return []
+    svg = sprite(nombres)
+    for pagina in destino.rglob("*.html"):
+        texto = pagina.read_text(encoding="utf-8")
+        if f'id="{PREFIJO}' in texto:
+            continue
+        # Fuera de la raíz de React: React 19 ignora nodos ajenos al hidratar el <body>
+        texto = re.sub(r"<body[^>]*>", lambda m: m.group(0) + svg, texto, count=1)
+        pagina.write_text(texto, encoding="utf-8")
+    return nombres
+
+
+if __name__ == "__main__":
+    iconos = generar(Path(sys.argv[1]) if len(sys.argv) > 1 else DIST_DIR)
+    print(f"Sprite con {len(iconos)} iconos: {', '.join(iconos)}")
@@ -0,0 +1,162 @@
+"""Canal de eventos por página: cuándo abre el navegador el websocket del backend.
+
+Reflex abre un websocket (Socket.IO) en cuanto carga cualquier página si la
+app tiene algún estado, y el backend mantiene un estado por pestaña mientras
+esté abierta. Este plugin decide por ruta, al compilar:
+
+- "sin_estado": la página no usa rx.State, eventos ni on_load; nunca conecta.
+- "diferida": la página tiene eventos pero no necesita estado al cargar; se
+  conecta con el primer evento del usuario (por ejemplo, enviar el formulario).
+- "inmediata": comportamiento normal de Reflex.
+
+El modo se detecta solo; una página puede declararlo con
+`app.add_page(..., context={"conexion": "diferida"})`. Declarar "sin_estado"
+en una página que sí usa estado es un error de compilación. Las rutas que no
+coinciden con ninguna página toman el modo de la página 404.
+
+`python -m terrigovsas.rendimiento.bucle` ejecuta el state.js parcheado en
+Node y comprueba que el bucle de eventos termina en cada modo.
+"""
+
+import dataclasses
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from reflex import constants, route
+from reflex.plugins import Plugin
+
+if TYPE_CHECKING:
+    from reflex.app import UnevaluatedPage
+
+SIN_ESTADO = "sin_estado"
+DIFERIDA = "diferida"
+INMEDIATA = "inmediata"
+MODOS = (SIN_ESTADO, DIFERIDA, INMEDIATA)
+
+# Archivo del runtime de Reflex que abre el websocket
+STATE_JS = "utils/state.js"
+
+
+class ConexionInvalidaError(ValueError):
+    """El modo declarado para una página no es compatible con lo que usa"""
+
+
+def modo(pagina: "UnevaluatedPage") -> str:
+    """Modo de conexión de una página, declarado o detectado"""
+    # Import diferido: este módulo se carga desde rxconfig, antes que la app
+    from reflex.compiler.compiler import into_component
+
+    from terrigovsas.build.export import usa_estado
+
+    declarado = pagina.context.get("conexion")
+    if declarado is not None and declarado not in MODOS:
+        raise ConexionInvalidaError(f"Modo de conexión desconocido en '{pagina.route}': {declarado}")
+    con_estado = bool(pagina.on_load) or usa_estado(into_component(pagina.component))
+    if declarado == SIN_ESTADO and con_estado:
+        raise ConexionInvalidaError(
+            f"La página '{pagina.route}' se declaró sin estado pero usa estado, eventos u on_load"
+        )
+    if declarado is not None:
+        return declarado
+    return INMEDIATA if con_estado else SIN_ESTADO
+
+
+def patrones(paginas: list["UnevaluatedPage"]) -> list[tuple[str, str]]:
+    """(regex de la ruta, modo) de la más específica a la más general, como el router de Reflex"""
+    por_ruta = {route.replace_brackets_with_keywords(pagina.route): pagina for pagina in paginas}
+    resultado = []
+    for clave in sorted(por_ruta, key=route.route_specifity):
+        regex = "^/$" if clave == constants.PageNames.INDEX_ROUTE else route.get_route_regex(clave).pattern
+        resultado.append((regex, modo(por_ruta[clave])))
+    return resultado
+
+
+def por_defecto(paginas: list["UnevaluatedPage"]) -> str:
+    """Modo de las rutas que no coinciden con ninguna página: el de la página 404"""
+    for pagina in paginas:
+        if pagina.route == constants.Page404.SLUG:
+            return modo(pagina)
+    return INMEDIATA
+
+
+def _reemplazar(codigo: str, ancla: str, nuevo: str) -> str:
+    if codigo.count(ancla) != 1:
+        raise RuntimeError(f"{STATE_JS} cambió en esta versión de Reflex; no se encontró: {ancla!r}")
+    return codigo.replace(ancla, nuevo)
+
+
+def parchear_state_js(patrones_por_ruta: list[tuple[str, str]], modo_por_defecto: str = INMEDIATA) -> str:
+    """state.js de Reflex con la conexión condicionada al modo de la ruta actual"""
+    # Siempre se parte de la plantilla original para que el parche sea idempotente
+    codigo = (Path(constants.Templates.Dirs.WEB_TEMPLATE) / STATE_JS).read_text()
+
+    codigo = _reemplazar(
+        codigo,
+        "const event_queue = [];\n",
+        "const event_queue = [];\n\n"
+        "// Modo de conexión por ruta, generado por terrigovsas.conexion\n"
+        f"const MODOS_CONEXION = {json.dumps(patrones_por_ruta)}.map(([p, m]) => [new RegExp(p), m]);\n"
+        "const modoConexion = (ruta) =>\n"
+        f'  MODOS_CONEXION.find(([patron]) => patron.test(ruta))?.[1] ?? "{modo_por_defecto}";\n',
+    )
+    # Función para conectar bajo demanda desde el hook
+    codigo = _reemplazar(
+        codigo,
+        "  const params = useRef(paramsR);\n",
+        "  const params = useRef(paramsR);\n"
+        "  const conectar = () => {\n"
+        "    if (!socket.current && Object.keys(initialState).length > 1 && !isBackendDisabled()) {\n"
+        '      connect(socket, dispatch, ["websocket"], setConnectErrors, client_storage, navigate, () => params.current);\n'
+        "    }\n"
+        "  };\n",
+    )
+    # Primer evento del usuario en una página diferida
+    codigo = _reemplazar(
+        codigo,
+        "    const combined_name = _events.map((e) => e.name).join(\"+++\");\n",
+        f'    if (modoConexion(window.location.pathname) !== "{SIN_ESTADO}") {{\n'
+        "      conectar();\n"
+        "    }\n"
+        "    const combined_name = _events.map((e) => e.name).join(\"+++\");\n",
+    )
+    # Al cargar solo conectan las páginas inmediatas; al navegar hacia una, también
+    codigo = _reemplazar(
+        codigo,
+        "    if (Object.keys(initialState).length > 1 && !isBackendDisabled()) {\n"
+        "      // Initialize the websocket connection.\n",
+        "    if (\n"
+        "      Object.keys(initialState).length > 1 &&\n"
+        "      !isBackendDisabled() &&\n"
+        f'      modoConexion(window.location.pathname) === "{INMEDIATA}"\n'
+        "    ) {\n"
+        "      // Initialize the websocket connection.\n",
+    )
+    codigo = _reemplazar(
+        codigo,
+        "  // Main event loop.\n",
+        "  useEffect(() => {\n"
+        f'    if (modoConexion(location.pathname) === "{INMEDIATA}") {{\n'
+        "      conectar();\n"
+        "    }\n"
+        "  }, [location.pathname]);\n\n"
+        "  // Main event loop.\n",
+    )
+    # El hidratado entra en la cola sin pasar por addEvents: sin socket, processEvent
+    # lo deja en la cola y el `while` del bucle principal no terminaría nunca
+    codigo = _reemplazar(
+        codigo,
+        "      while (event_queue.length > 0 && !event_processing) {\n",
+        "      while (event_queue.length > 0 && !event_processing && (socket.current || !isStateful())) {\n",
+    )
+    return codigo
+
+
+@dataclasses.dataclass
+class ConexionPorPaginaPlugin(Plugin):
+    """Parchea el runtime de Reflex para abrir el websocket solo donde hace falta"""
+
+    def pre_compile(self, **context):
+        paginas = context["unevaluated_pages"]
+        patrones_por_ruta, modo_por_defecto = patrones(paginas), por_defecto(paginas)
+        context["add_modify_task"](STATE_JS, lambda _: parchear_state_js(patrones_por_ruta, modo_por_defecto))
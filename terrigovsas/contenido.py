@@ -0,0 +1,100 @@
+"""Modelo de contenido del sitio (servicios y datos de contacto).
+
+El YAML se parsea una sola vez a registros inmutables; solo se vuelve a leer
+si el archivo cambia. La ruta puede sobrescribirse con TERRIGOV_CONTENIDO.
+"""
+
+import os
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import yaml
+
+RUTA = Path(os.environ.get("TERRIGOV_CONTENIDO", Path(__file__).with_name("contenido.yaml")))
+
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def slugificar(texto: str) -> str:
+    """Minúsculas ASCII separadas por guiones"""
+    ascii_ = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "-", ascii_.lower()).strip("-")
+
+
+@dataclass(frozen=True, slots=True)
+class Servicio:
+    """Entrada de la sección de servicios"""
+
+    titulo: str
+    descripcion: str
+    icono: str
+    # Texto de la página propia del servicio; párrafos separados por una línea en blanco
+    detalle: str
+
+    @property
+    def slug(self) -> str:
+        """Identificador para URLs y analítica (p. ej. "decisiones-basadas-en-datos")"""
+        return slugificar(self.titulo)
+
+    @property
+    def ruta(self) -> str:
+        """Ruta de la página del servicio"""
+        return f"/servicios/{self.slug}"
+
+
+@dataclass(frozen=True, slots=True)
+class Contacto:
+    """Datos de contacto repetidos en navbar, hero y contacto"""
+
+    email: str
+    telefono: str
+    whatsapp: str
+    ubicacion: str
+
+
+@dataclass(frozen=True, slots=True)
+class Contenido:
+    """Todo el contenido editable de la página"""
+
+    contacto: Contacto
+    servicios: tuple[Servicio, ...]
+
+
+@lru_cache(maxsize=1)
+def _cargar(ruta: Path, version: int) -> Contenido:
+    datos = yaml.load(ruta.read_text(encoding="utf-8"), Loader=_Loader)
+    return Contenido(
+        contacto=Contacto(**datos["contacto"]),
+        servicios=tuple(Servicio(**servicio) for servicio in datos["servicios"]),
+    )
+
+
+def contenido() -> Contenido:
+    """Contenido actual; la versión es el mtime, así que un cambio invalida la caché"""
+    return _cargar(RUTA, RUTA.stat().st_mtime_ns)
+
+
+def vigilar(intervalo: float = 0.5) -> None:
+    """Durante `reflex run`, toca este módulo cuando cambia el YAML.
+
+    El recargador de Reflex ignora los .yaml; al tocar un .py el backend se
+    reinicia y, gracias a la caché de secciones, solo se recompilan las
+    secciones que dependen de las entradas modificadas.
+    """
+    import time
+
+    ultima = RUTA.stat().st_mtime_ns
+    while True:
+        time.sleep(intervalo)
+        actual = RUTA.stat().st_mtime_ns
+        if actual != ultima:
+            ultima = actual
+            Path(__file__).touch()
+            print(f"{RUTA.name} cambió, recargando")
+
+
+if __name__ == "__main__":
+    vigilar()
@@ -0,0 +1,68 @@
+"""Secciones bajo el pliegue: content-visibility e hidratación diferida"""
+
+import reflex as rx
+
+_HIDRATACION_DIFERIDA = """
+function HidratacionDiferida({ children, ancla, className }) {
+  const ref = useRef(null);
+  // En el prerender y en la navegación del cliente se renderiza normal;
+  // al hidratar HTML ya prerenderizado se conserva el DOM hasta que sea visible
+  const [hidratar, setHidratar] = useState(
+    () => typeof document === "undefined" || !document.getElementById(ancla)?.hasChildNodes()
+  );
+  useEffect(() => {
+    if (hidratar) return;
+    if (!("IntersectionObserver" in window)) {
+      setHidratar(true);
+      return;
+    }
+    const observador = new IntersectionObserver(
+      (entradas) => {
+        if (entradas.some((entrada) => entrada.isIntersecting)) {
+          observador.disconnect();
+          setHidratar(true);
+        }
+      },
+      { rootMargin: "200px" },
+    );
+    observador.observe(ref.current);
+    return () => observador.disconnect();
+  }, [hidratar]);
+  if (!hidratar) {
+    return jsx("div", {
+      id: ancla, ref, className, suppressHydrationWarning: true, dangerouslySetInnerHTML: { __html: "" },
+    });
+  }
+  return jsx("div", { id: ancla, ref, className }, children);
+}
+"""
+
+
+class HidratacionDiferida(rx.Component):
+    """Contenedor que no hidrata su contenido hasta acercarse al viewport"""
+
+    tag = "HidratacionDiferida"
+
+    # id del contenedor (no se usa `id` para que Reflex no cree un ref propio)
+    ancla: rx.Var[str]
+
+    def add_imports(self):
+        return {"react": ["useRef", "useState", "useEffect"]}
+
+    def add_custom_code(self) -> list[str]:
+        return [_HIDRATACION_DIFERIDA]
+
+
+def bajo_el_pliegue(seccion: rx.Component, nombre: str, altura: str) -> rx.Component:
+    """Envuelve una sección que no se ve al cargar.
+
+    El navegador omite su layout y pintura hasta que se acerca al viewport
+    (reservando `altura` como tamaño intrínseco) y React no la hidrata hasta
+    entonces.
+    """
+    return HidratacionDiferida.create(
+        seccion,
+        ancla=f"diferida-{nombre}",
+        content_visibility="auto",
+        contain_intrinsic_size=f"auto {altura}",
+    )
@@ -0,0 +1,163 @@
+"""Servidor ASGI del sitio exportado: archivos precomprimidos, caché inmutable y ETag/304.
+
+Todo el sitio se carga en memoria al arrancar; nunca se comprime al vuelo.
+Las páginas llevan la cabecera `Link` con sus recursos críticos, y un 103
+Early Hints previo si el servidor ASGI ofrece la extensión.
+Uso: `granian --interface asgi --factory terrigovsas.estaticos:crear_app`
+"""
+
+import hashlib
+import json
+import mimetypes
+import os
+from pathlib import Path
+
+# Manifiesto escrito por la etapa de compresión
+MANIFIESTO = "asset-manifest.json"
+
+CACHE_INMUTABLE = b"public, max-age=31536000, immutable"
+CACHE_REVALIDAR = b"public, max-age=0, must-revalidate"
+
+# Codificaciones precomprimidas, en orden de preferencia
+CODIFICACIONES = ((b"br", ".br"), (b"gzip", ".gz"))
+
+mimetypes.add_type("application/manifest+json", ".webmanifest")
+mimetypes.add_type("image/avif", ".avif")
+mimetypes.add_type("image/webp", ".webp")
+
+
+class Recurso:
+    """Un archivo servible con sus variantes comprimidas y cabeceras precalculadas"""
+
+    __slots__ = ("etag", "cache", "cuerpos", "cabeceras", "pistas")
+
+    def __init__(self, archivo: Path, inmutable: bool, enlaces: list[str] = ()):
+        datos = archivo.read_bytes()
+        tipo = mimetypes.guess_type(archivo.name)[0] or "application/octet-stream"
+        if tipo.startswith("text/") or tipo.endswith(("javascript", "json")):
+            tipo += "; charset=utf-8"
+        # ETag débil: el mismo recurso vale para todas sus codificaciones
+        self.etag = f'W/"{hashlib.sha256(datos).hexdigest()[:16]}"'.encode()
+        self.cache = CACHE_INMUTABLE if inmutable else CACHE_REVALIDAR
+        # Mensaje 103 precalculado; None si la página no tiene recursos críticos
+        self.pistas = None
+        if enlaces:
+            self.pistas = {"type": "http.response.early_hint", "links": [e.encode() for e in enlaces]}
+        self.cuerpos = {b"identity": datos}
+        for codificacion, sufijo in CODIFICACIONES:
+            hermano = archivo.with_name(archivo.name + sufijo)
+            if hermano.exists():
+                self.cuerpos[codificacion] = hermano.read_bytes()
+        self.cabeceras = {
+            codificacion: [
+                (b"content-type", tipo.encode()),
+                (b"content-length", str(len(cuerpo)).encode()),
+                (b"cache-control", self.cache),
+                (b"etag", self.etag),
+                (b"vary", b"accept-encoding"),
+                *([(b"content-encoding", codificacion)] if codificacion != b"identity" else []),
+                *([(b"link", ", ".join(enlaces).encode())] if enlaces else []),
+            ]
+            for codificacion, cuerpo in self.cuerpos.items()
+        }
+
+    def negociar(self, aceptadas: bytes) -> bytes:
+        """Elige la mejor codificación disponible según Accept-Encoding"""
+        if len(self.cuerpos) > 1 and aceptadas:
+            tokens = {
+                partes[0].strip()
+                for token in aceptadas.split(b",")
+                if not (partes := token.split(b";"))[1:]
+                or partes[1].strip() not in (b"q=0", b"q=0.0")
+            }
+            for codificacion, _ in CODIFICACIONES:
+                if codificacion in self.cuerpos and codificacion in tokens:
+                    return codificacion
+        return b"identity"
+
+
+def cargar_sitio(directorio: Path) -> dict[str, Recurso]:
+    """Indexa el sitio exportado por ruta URL"""
+    manifiesto_path = directorio / MANIFIESTO
+    inmutables, enlaces = set(), {}
+    if manifiesto_path.exists():
+        manifiesto = json.loads(manifiesto_path.read_text(encoding="utf-8"))
+        inmutables = set(manifiesto["inmutables"])
+        enlaces = manifiesto.get("enlaces", {})
+
+    rutas = {}
+    for archivo in sorted(directorio.rglob("*")):
+        if not archivo.is_file() or archivo.suffix in (".br", ".gz"):
+            continue
+        ruta = "/" + archivo.relative_to(directorio).as_posix()
+        recurso = Recurso(archivo, inmutable=ruta in inmutables, enlaces=enlaces.get(ruta, ()))
+        rutas[ruta] = recurso
+        # /servicios/index.html también responde a /servicios/ y /servicios
+        if archivo.name == "index.html":
+            carpeta = ruta[: -len("index.html")]
+            rutas.setdefault(carpeta, recurso)
+            rutas.setdefault(carpeta.rstrip("/") or "/", recurso)
+        elif archivo.suffix == ".html":
+            rutas.setdefault(ruta[: -len(".html")], recurso)
+    return rutas
+
+
+class ServidorEstatico:
+    """Aplicación ASGI que sirve el sitio exportado desde memoria"""
+
+    def __init__(self, directorio: Path):
+        self.rutas = cargar_sitio(directorio)
+        self.no_encontrado = self.rutas.get("/404.html")
+
+    def buscar(self, ruta: str) -> Recurso | None:
+        """Recurso para una ruta URL, o None si no existe"""
+        return self.rutas.get(ruta)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await receive()
+            await send({"type": "lifespan.startup.complete"})
+            await receive()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+        await self.responder(scope, send, self.buscar(scope["path"]))
+
+    async def responder(self, scope, send, recurso: Recurso | None) -> None:
+        """Envía el recurso negociando codificación y respondiendo 304 si no cambió"""
+        if scope["method"] not in ("GET", "HEAD"):
+            await send({"type": "http.response.start", "status": 405,
+                        "headers": [(b"allow", b"GET, HEAD")]})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        estado = 200
+        if recurso is None:
+            recurso, estado = self.no_encontrado, 404
+            if recurso is None:
+                await send({"type": "http.response.start", "status": 404, "headers": []})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        aceptadas = b""
+        for nombre, valor in scope["headers"]:
+            if nombre == b"if-none-match" and estado == 200 and recurso.etag in valor:
+                await send({"type": "http.response.start", "status": 304, "headers": [
+                    (b"etag", recurso.etag), (b"cache-control", recurso.cache),
+                ]})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            if nombre == b"accept-encoding":
+                aceptadas = valor
+
+        if recurso.pistas is not None and "http.response.early_hint" in scope.get("extensions", {}):
+            await send(recurso.pistas)
+        codificacion = recurso.negociar(aceptadas)
+        await send({"type": "http.response.start", "status": estado,
+                    "headers": recurso.cabeceras[codificacion]})
+        cuerpo = b"" if scope["method"] == "HEAD" else recurso.cuerpos[codificacion]
+        await send({"type": "http.response.body", "body": cuerpo})
+
+
+def crear_app() -> ServidorEstatico:
+    """Fábrica para granian; el directorio se toma de TERRIGOV_DIST (por defecto dist/)"""
+    return ServidorEstatico(Path(os.environ.get("TERRIGOV_DIST", "dist")))
@@ -0,0 +1,143 @@
+"""Extracción de estilos en línea a clases CSS atómicas compartidas.
+
+Cada conjunto idéntico de props de estilo (incluidos los `rx.breakpoints`)
+se emite una sola vez como clase en una hoja estática, en lugar de un
+objeto de estilo por componente procesado por emotion en el navegador.
+Los colores de la paleta se emiten como propiedades personalizadas CSS.
+"""
+
+import dataclasses
+import hashlib
+import re
+
+from reflex.components.component import Component
+from reflex.constants import Dirs
+from reflex.plugins import Plugin
+from reflex.style import Style, format_as_emotion
+from reflex.vars.base import LiteralVar
+
+# Hoja generada, relativa al directorio de estilos de .web
+HOJA = "estilos_atomicos.css"
+
+# Propiedades CSS numéricas que no llevan unidad
+SIN_UNIDAD = {"opacity", "zIndex", "fontWeight", "lineHeight", "flex", "flexGrow", "flexShrink", "order"}
+
+# Reglas registradas: clase -> CSS, en orden de aparición
+REGLAS: dict[str, str] = {}
+
+# Paleta emitida como propiedades personalizadas (--color-<nombre>)
+PALETA: dict[str, str] = {}
+
+_HEX = re.compile(r"#[0-9A-Fa-f]{6}(?![0-9A-Fa-f])")
+_MAYUSCULA = re.compile(r"[A-Z]")
+
+
+class NoExtraible(Exception):
+    """El estilo depende de estado o no tiene un valor literal"""
+
+
+def registrar_paleta(colores: dict[str, str]) -> None:
+    """Declara los colores que se sustituyen por var(--color-<nombre>)"""
+    PALETA.update(colores)
+
+
+def _propiedad(clave: str) -> str:
+    return _MAYUSCULA.sub(lambda m: "-" + m.group().lower(), clave)
+
+
+def _valor(clave: str, valor) -> str:
+    if isinstance(valor, LiteralVar):
+        valor = valor._var_value
+    if isinstance(valor, bool) or not isinstance(valor, (str, int, float)):
+        raise NoExtraible(clave)
+    if isinstance(valor, (int, float)):
+        return str(valor) if clave in SIN_UNIDAD or valor == 0 else f"{valor}px"
+    por_hex = {v.lower(): k for k, v in PALETA.items()}
+    return _HEX.sub(
+        lambda m: f"var(--color-{por_hex[m.group().lower()]})"
+        if m.group().lower() in por_hex
+        else m.group(),
+        valor,
+    )
+
+
+def _bloques(selector: str, estilo: dict) -> list[str]:
+    """Serializa un estilo emotion a reglas CSS bajo `selector`"""
+    declaraciones, anidados, medias = [], [], []
+    for clave, valor in estilo.items():
+        if isinstance(valor, dict):
+            if clave.startswith("@"):
+                medias.append(f"{clave}{{{''.join(_bloques(selector, valor))}}}")
+            elif clave.startswith("&"):
+                anidados.extend(_bloques(clave.replace("&", selector), valor))
+            else:
+                raise NoExtraible(clave)
+        else:
+            declaraciones.append(f"{_propiedad(clave)}:{_valor(clave, valor)}")
+    propio = [f"{selector}{{{';'.join(declaraciones)}}}"] if declaraciones else []
+    return [*propio, *anidados, *medias]
+
+
+def _extraer_componente(componente: Component) -> tuple[str, str] | None:
+    if not componente.style or not isinstance(componente.class_name, (str, type(None))):
+        return None
+    # Un className en custom_attrs pisaría la clase generada y el estilo se perdería
+    if "className" in componente.custom_attrs:
+        return None
+    emotion = format_as_emotion(componente.style)
+    if emotion is None or emotion._var_data is not None:
+        return None
+    # La huella se calcula sobre el CSS con un selector neutro
+    try:
+        cuerpo = "".join(_bloques("&&", emotion))
+    except NoExtraible:
+        return None
+    clase = "e-" + hashlib.sha1(cuerpo.encode()).hexdigest()[:7]
+    # Selector doble para ganar a las clases de Radix como lo hacía emotion
+    css = cuerpo.replace("&&", f".{clase}.{clase}")
+
+    componente.style = Style()
+    componente.class_name = f"{componente.class_name} {clase}" if componente.class_name else clase
+    return clase, css
+
+
+def extraer(componente: Component) -> dict[str, str]:
+    """Mueve a clases compartidas los estilos literales del árbol y devuelve sus reglas"""
+    reglas = {}
+    pendientes = [componente]
+    while pendientes:
+        actual = pendientes.pop()
+        if isinstance(actual, Component):
+            if (extraida := _extraer_componente(actual)) is not None:
+                reglas[extraida[0]] = extraida[1]
+            pendientes.extend(reversed(actual.children))
+    registrar(reglas)
+    return reglas
+
+
+def registrar(reglas: dict[str, str]) -> None:
+    """Añade reglas (p. ej. restauradas de la caché de secciones) a la hoja"""
+    for clase, css in reglas.items():
+        REGLAS.setdefault(clase, css)
+
+
+def hoja_de_estilos() -> str:
+    """Contenido de la hoja: paleta en :root seguida de las clases atómicas"""
+    variables = ";".join(f"--color-{nombre}:{valor}" for nombre, valor in PALETA.items())
+    return "\n".join([f":root{{{variables}}}", *REGLAS.values()]) + "\n"
+
+
+def _guardar_hoja(contenido: str) -> tuple[str, str]:
+    return f"{Dirs.STYLES}/{HOJA}", contenido
+
+
+@dataclasses.dataclass
+class EstilosAtomicosPlugin(Plugin):
+    """Escribe la hoja de clases atómicas y la añade a la hoja raíz"""
+
+    def get_stylesheet_paths(self, **context) -> list[str]:
+        return [f"./{HOJA}"]
+
+    def pre_compile(self, **context):
+        # Las páginas ya se evaluaron: el registro está completo
+        context["add_save_task"](_guardar_hoja, hoja_de_estilos())
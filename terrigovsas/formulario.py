@@ -0,0 +1,115 @@
+"""Formulario de contacto: el evento solo encola, la escritura es diferida"""
+
+import os
+from typing import Any
+
+import reflex as rx
+
+from terrigovsas import solicitudes
+from terrigovsas.iconos import icono
+
+
+# Proxies propios delante del servidor (Railway: 1). Cada uno añade a la derecha
+# de X-Forwarded-For la IP de quien le habló; lo de más a la izquierda lo
+# escribe el cliente y no sirve para limitar por IP
+PROXIES_CONFIABLES = int(os.environ.get("TERRIGOV_PROXIES", 0))
+
+
+def ip_cliente(reenviada: str, directa: str, proxies: int = PROXIES_CONFIABLES) -> str:
+    """IP del cliente según el último proxy confiable, o la de la conexión sin proxies"""
+    direcciones = [d.strip() for d in reenviada.split(",") if d.strip()]
+    if proxies <= 0 or len(direcciones) < proxies:
+        return directa
+    return direcciones[-proxies]
+
+
+class FormularioContacto(rx.State):
+    """Estado del formulario de la sección de contacto"""
+
+    enviado: bool = False
+    error: str = ""
+
+    @rx.event
+    async def enviar(self, datos: dict[str, Any]):
+        """Encola la solicitud y responde de inmediato"""
+        reenviada = self.router.headers.raw_headers.get("x-forwarded-for", "")
+        cliente = ip_cliente(reenviada, self.router.session.client_ip)
+        try:
+            solicitudes.recibir(datos, cliente)
+        except solicitudes.SolicitudRechazada as rechazo:
+            self.error = str(rechazo)
+            return
+        self.error = ""
+        self.enviado = True
+
+
+def campo(nombre: str, etiqueta: str, colors: dict, **props) -> rx.Component:
+    """Campo de texto del formulario con su etiqueta"""
+    control = rx.text_area if nombre == "mensaje" else rx.input
+    # El control va dentro del label: queda asociado sin necesitar un id
+    return rx.el.label(
+        rx.text(etiqueta, as_="span", size="2", weight="medium", color=colors["light"]),
+        control(
+            name=nombre,
+            required=True,
+            max_length=solicitudes.CAMPOS[nombre],
+            size="3",
+            width="100%",
+            **props
+        ),
+        display="flex",
+        flex_direction="column",
+        gap="0.25rem",
+        width="100%"
+    )
+
+
+def formulario_contacto(colors: dict) -> rx.Component:
+    """Formulario de solicitud: nombre, entidad, municipio y mensaje"""
+    return rx.cond(
+        FormularioContacto.enviado,
+        rx.callout.root(
+            rx.callout.icon(icono("circle-check", size=16)),
+            rx.callout.text("Recibimos tu solicitud. Te contactaremos pronto."),
+            color_scheme="green",
+            width="100%"
+        ),
+        rx.form(
+            rx.vstack(
+                rx.grid(
+                    campo("nombre", "Nombre", colors, custom_attrs={"autoComplete": "name"}),
+                    campo("entidad", "Entidad", colors, custom_attrs={"autoComplete": "organization"}),
+                    campo("municipio", "Municipio", colors, custom_attrs={"autoComplete": "address-level2"}),
+                    columns=rx.breakpoints(initial="1", sm="3"),
+                    spacing="4",
+                    width="100%"
+                ),
+                campo("mensaje", "Mensaje", colors, rows="4"),
+                rx.cond(
+                    FormularioContacto.error != "",
+                    rx.callout.root(
+                        rx.callout.icon(icono("triangle-alert", size=16)),
+                        rx.callout.text(FormularioContacto.error),
+                        color_scheme="red",
+                        width="100%"
+                    ),
+                ),
+                rx.button(
+                    "Enviar solicitud",
+                    type="submit",
+                    size="3",
+                    background=colors["accent"],
+                    color=colors["light"],
+                    border_radius="50px",
+                    padding="0 2rem",
+                    _hover={"background": "#00B889"}
+                ),
+                spacing="4",
+                align="center",
+                width="100%"
+            ),
+            on_submit=FormularioContacto.enviar,
+            reset_on_submit=True,
+            width="100%"
+        ),
+    )
@@ -0,0 +1,51 @@
+"""Fuente Inter autoalojada y subconjuntada (precarga + font-display: swap)"""
+
+import json
+from functools import lru_cache
+
+import reflex as rx
+
+from terrigovsas.imagenes import ASSETS_DIR
+
+FUENTES_DIR = ASSETS_DIR / "fonts"
+MANIFIESTO = FUENTES_DIR / "manifest.json"
+
+FAMILIA = "Inter"
+PILA = "Inter, system-ui, sans-serif"
+
+
+@lru_cache(maxsize=None)
+def manifiesto() -> dict:
+    """Lee una sola vez el manifiesto generado por la etapa de fuentes"""
+    if not MANIFIESTO.exists():
+        return {}
+    return json.loads(MANIFIESTO.read_text(encoding="utf-8"))
+
+
+def font_face(meta: dict) -> str:
+    """@font-face de la fuente subconjuntada; Radix toma la misma pila"""
+    return (
+        f"@font-face{{font-family:{FAMILIA};"
+        f"src:url({meta['archivo']}) format('woff2');"
+        f"font-weight:{meta['pesos']};font-style:normal;font-display:swap;"
+        f"unicode-range:{meta['unicode_range']}}}"
+        f".radix-themes{{--default-font-family:{PILA}}}"
+    )
+
+
+def componentes_head() -> list[rx.Component]:
+    """Precarga del WOFF2 y @font-face en línea, sin petición bloqueante"""
+    meta = manifiesto()
+    if not meta:
+        # Sin fuente generada (p. ej. en desarrollo) se usa system-ui
+        return []
+    return [
+        rx.el.link(
+            rel="preload",
+            href=meta["archivo"],
+            type="font/woff2",
+            cross_origin="anonymous",
+            custom_attrs={"as": "font"},
+        ),
+        rx.el.style(font_face(meta)),
+    ]
@@ -0,0 +1,80 @@
+"""Iconos de Lucide como referencias a un sprite SVG en línea.
+
+En producción cada icono es `<svg><use href="#i-nombre"/></svg>`: no hay un
+componente de React por icono y el bundle no lleva su código. La etapa de
+build `terrigovsas.build.sprite` inserta en cada página un único `<svg>` oculto
+con un `<symbol>` por icono realmente usado. En desarrollo (sin esa etapa) se
+usa `rx.icon`.
+
+El nombre se valida al construir el componente, así que un icono calculado
+(por ejemplo desde contenido.yaml) que no exista en Lucide falla al compilar.
+"""
+
+import reflex as rx
+from reflex.components.el.elements.base import BaseHTML
+from reflex.components.lucide.icon import LUCIDE_ICON_LIST
+from reflex.utils.exec import is_prod_mode
+
+# Prefijo de los id de <symbol> en el sprite
+PREFIJO = "i-"
+
+# Atributos de presentación de Lucide. Van en cada <symbol> del sprite y su
+# contenido los hereda, así que cada icono de la página solo lleva su tamaño
+PRESENTACION = {
+    "fill": "none",
+    "stroke": "currentColor",
+    "stroke-width": "2",
+    "stroke-linecap": "round",
+    "stroke-linejoin": "round",
+}
+
+_NOMBRES = frozenset(LUCIDE_ICON_LIST)
+
+
+class IconoDesconocidoError(ValueError):
+    """El nombre no corresponde a ningún icono de Lucide"""
+
+
+class Uso(BaseHTML):
+    """Elemento SVG <use>"""
+
+    tag = "use"
+
+    # Referencia al <symbol> del sprite
+    href: rx.Var[str]
+
+
+def normalizar(nombre: str) -> str:
+    """Nombre de Lucide en kebab-case; falla si el icono no existe"""
+    clave = nombre.strip().lower().replace("_", "-")
+    if clave.replace("-", "_") not in _NOMBRES:
+        raise IconoDesconocidoError(f"'{nombre}' no es un icono de Lucide")
+    return clave
+
+
+def icono(nombre: str, size: int = 24, **props) -> rx.Component:
+    """Icono de Lucide; acepta los mismos props de estilo que `rx.icon`"""
+    clave = normalizar(nombre)
+    if not is_prod_mode():
+        return rx.icon(clave, size=size, **props)
+    return rx.el.svg(
+        Uso.create(href=f"#{PREFIJO}{clave}"),
+        width=size,
+        height=size,
+        flex_shrink="0",
+        # class_name (no custom_attrs) para que se sume a la clase atómica de estilos.extraer
+        class_name="lucide",
+        custom_attrs={"aria-hidden": "true"},
+        **props,
+    )
+
+
+if __name__ == "__main__":
+    # Comprobación: un icono con color conserva su clase atómica tras la extracción
+    from terrigovsas import estilos
+
+    componente = icono("brain", color="#FF0000")
+    reglas = estilos.extraer(componente)
+    clases = str(componente.render()["props"])
+    assert reglas and all(clase in clases for clase in reglas), f"clase atómica perdida: {clases}"
+    print(f"icono con clases {', '.join(reglas)} (modo {'producción' if is_prod_mode() else 'desarrollo'})")
@@ -0,0 +1,89 @@
+"""Imágenes responsivas autoalojadas (variantes AVIF/WebP con srcset)"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+
+import reflex as rx
+from reflex.components.core.breakpoints import breakpoint_names, breakpoints_values
+
+ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
+IMG_DIR = ASSETS_DIR / "img"
+MANIFIESTO = IMG_DIR / "manifest.json"
+
+# Densidades de pantalla para las que se generan variantes
+DENSIDADES = (1, 2)
+
+# Imágenes de la página: origen (archivo en assets/ o URL) y ancho CSS por breakpoint
+IMAGENES = {
+    "logo": {
+        "origen": "https://i.postimg.cc/PJgFKg6x/Icon-2-SVG.png",
+        "anchos": {"initial": 35, "sm": 42, "md": 50},
+    },
+    "pantalla-civi": {
+        "origen": "https://i.postimg.cc/MGCkv2tb/Pantalla-Civi.png",
+        "anchos": {"initial": 300, "sm": 400, "md": 450},
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def manifiesto() -> dict:
+    """Lee una sola vez el manifiesto generado por la etapa de imágenes"""
+    if not MANIFIESTO.exists():
+        return {}
+    return json.loads(MANIFIESTO.read_text(encoding="utf-8"))
+
+
+def media_query(breakpoint: str) -> str:
+    """Condición `sizes` equivalente a un breakpoint de rx.breakpoints"""
+    return f"(min-width: {breakpoints_values[breakpoint_names.index(breakpoint)]})"
+
+
+def atributo_sizes(anchos: dict) -> str:
+    """Construye `sizes` de mayor a menor breakpoint, terminando en `initial`"""
+    condiciones = [
+        f"{media_query(bp)} {anchos[bp]}px"
+        for bp in reversed(breakpoint_names)
+        if bp in anchos
+    ]
+    return ", ".join([*condiciones, f"{anchos['initial']}px"])
+
+
+def imagen_responsiva(
+    nombre: str, alt: str, diferida: bool = False, prioritaria: bool = False, **props
+) -> rx.Component:
+    """Imagen con <picture> AVIF/WebP, srcset/sizes y dimensiones intrínsecas.
+
+    Con `diferida=True` (imágenes bajo el pliegue) se carga y decodifica en diferido.
+    Con `prioritaria=True` (la imagen LCP) lleva `fetchpriority="high"` y es la que
+    precarga `terrigovsas.build.recursos`.
+    """
+    anchos = IMAGENES[nombre]["anchos"]
+    ancho_css = rx.breakpoints(**{bp: f"{px}px" for bp, px in anchos.items()})
+    props.setdefault("width", ancho_css)
+    if diferida:
+        props.update(loading="lazy", decoding="async")
+    if prioritaria:
+        props["custom_attrs"] = {**props.get("custom_attrs", {}), "fetchpriority": "high"}
+
+    meta = manifiesto().get(nombre)
+    if meta is None:
+        # Sin variantes generadas (p. ej. en desarrollo) se usa el original
+        return rx.image(src=IMAGENES[nombre]["origen"], alt=alt, **props)
+
+    sizes = atributo_sizes(anchos)
+    srcsets = {
+        formato: ", ".join(f"{ruta} {ancho}w" for ancho, ruta in variantes)
+        for formato, variantes in meta["variantes"].items()
+    }
+    return rx.el.picture(
+        rx.el.source(type="image/avif", src_set=srcsets["avif"], sizes=sizes),
+        rx.image(
+            src=meta["variantes"]["webp"][0][1],
+            src_set=srcsets["webp"],
+            sizes=sizes,
+            alt=alt,
+            **{**props, "custom_attrs": {**props.get("custom_attrs", {}), "width": meta["ancho"], "height": meta["alto"]}},
+        ),
+    )
@@ -0,0 +1,231 @@
+"""Métricas del servidor en formato Prometheus y cabecera Server-Timing.
+
+Todo se preasigna al importar: un histograma fijo por clase de ruta y sus
+etiquetas ya formateadas, así medir una petición solo suma enteros. Cada
+worker de granian lleva sus propias métricas; la etiqueta `worker` (PID)
+permite agregarlas.
+
+GET /metrics solo responde a loopback, a las redes de TERRIGOV_METRICAS_REDES
+o con el token de TERRIGOV_METRICAS_TOKEN; al resto, 404.
+"""
+
+import hmac
+import ipaddress
+import os
+import time
+from bisect import bisect_left
+
+import psutil
+from reflex.event import Event
+from reflex.middleware import Middleware
+from reflex.state import BaseState, StateUpdate
+
+RUTA = "/metrics"
+
+# Límites superiores de las cubetas de latencia, en segundos
+LIMITES = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Manejadores de eventos con histograma propio; el resto va a "otro"
+MAX_MANEJADORES = 50
+# Eventos en curso; si un manejador falla no hay postprocess y su inicio queda huérfano
+MAX_EN_CURSO = 10_000
+
+# Detrás del proxy todas las peticiones llegan desde una IP privada: por
+# defecto solo loopback. Prometheus puede entrar por red (CIDRs separados
+# por comas) o con `Authorization: Bearer <token>`
+REDES_PERMITIDAS = tuple(
+    ipaddress.ip_network(red.strip(), strict=False)
+    for red in os.environ.get("TERRIGOV_METRICAS_REDES", "").split(",")
+    if red.strip()
+)
+TOKEN = os.environ.get("TERRIGOV_METRICAS_TOKEN", "")
+
+_PROCESO = psutil.Process()
+_WORKER = str(os.getpid())
+
+
+class Histograma:
+    """Histograma acumulativo de cubetas fijas"""
+
+    __slots__ = ("cuentas", "suma")
+
+    def __init__(self):
+        self.cuentas = [0] * (len(LIMITES) + 1)
+        self.suma = 0.0
+
+    def observar(self, segundos: float) -> None:
+        self.cuentas[bisect_left(LIMITES, segundos)] += 1
+        self.suma += segundos
+
+    def lineas(self, nombre: str, etiquetas: str) -> list[str]:
+        lineas, acumulado = [], 0
+        for limite, cuenta in zip((*map(str, LIMITES), "+Inf"), self.cuentas):
+            acumulado += cuenta
+            lineas.append(f'{nombre}_bucket{{{etiquetas},le="{limite}"}} {acumulado}')
+        lineas.append(f"{nombre}_sum{{{etiquetas}}} {self.suma:.6f}")
+        lineas.append(f"{nombre}_count{{{etiquetas}}} {acumulado}")
+        return lineas
+
+
+class Ruta:
+    """Contadores de una clase de ruta"""
+
+    __slots__ = ("etiquetas", "latencia", "bytes")
+
+    def __init__(self, nombre: str, tipo: str):
+        self.etiquetas = f'worker="{_WORKER}",ruta="{nombre}",tipo="{tipo}"'
+        self.latencia = Histograma()
+        self.bytes = 0
+
+
+ESTATICO = Ruta("estatico", "estatico")
+# Rutas dinámicas conocidas, por prefijo; lo demás va a OTRA
+DINAMICAS = {
+    prefijo: Ruta(prefijo, "dinamico")
+    for prefijo in ("/_event", "/_upload", "/_health", "/ping", "/_analitica", RUTA)
+}
+OTRA = Ruta("otra", "dinamico")
+
+_websockets = 0
+_eventos: dict[str, Histograma] = {}
+_eventos_otros = Histograma()
+
+# Segundos que tardó el worker en evaluar la app al arrancar (lo fija servidor.py)
+arranque_s = 0.0
+
+
+def clasificar(ruta: str) -> Ruta:
+    """Ruta preasignada para una URL del backend"""
+    for prefijo, metrica in DINAMICAS.items():
+        if ruta.startswith(prefijo):
+            return metrica
+    return OTRA
+
+
+async def medir(metrica: Ruta, app, scope, receive, send) -> None:
+    """Llama a `app` midiendo latencia y bytes, y añade Server-Timing a la respuesta"""
+    inicio = time.perf_counter()
+
+    async def enviar(mensaje):
+        if mensaje["type"] == "http.response.start":
+            duracion = (time.perf_counter() - inicio) * 1000
+            mensaje = {**mensaje, "headers": [
+                *mensaje.get("headers", ()), (b"server-timing", b"app;dur=%.2f" % duracion),
+            ]}
+        elif mensaje["type"] == "http.response.body":
+            metrica.bytes += len(mensaje.get("body", b""))
+        await send(mensaje)
+
+    try:
+        await app(scope, receive, enviar)
+    finally:
+        metrica.latencia.observar(time.perf_counter() - inicio)
+
+
+def permitido(scope) -> bool:
+    """Acceso a los endpoints internos: loopback, redes de REDES_PERMITIDAS o el TOKEN"""
+    if TOKEN:
+        cabeceras = dict(scope.get("headers", ()))
+        if hmac.compare_digest(cabeceras.get(b"authorization", b""), f"Bearer {TOKEN}".encode()):
+            return True
+    cliente = scope.get("client")
+    if not cliente:
+        return False
+    try:
+        direccion = ipaddress.ip_address(cliente[0])
+    except ValueError:
+        return False
+    return direccion.is_loopback or any(direccion in red for red in REDES_PERMITIDAS)
+
+
+def exposicion() -> str:
+    """Texto de /metrics en formato de exposición de Prometheus"""
+    from terrigovsas import secciones
+
+    rutas = (ESTATICO, *DINAMICAS.values(), OTRA)
+    lineas = ["# TYPE terrigov_peticion_segundos histogram"]
+    for ruta in rutas:
+        lineas += ruta.latencia.lineas("terrigov_peticion_segundos", ruta.etiquetas)
+    lineas.append("# TYPE terrigov_peticiones_total counter")
+    lineas += [f"terrigov_peticiones_total{{{r.etiquetas}}} {sum(r.latencia.cuentas)}" for r in rutas]
+    lineas.append("# TYPE terrigov_bytes_enviados_total counter")
+    lineas += [f"terrigov_bytes_enviados_total{{{r.etiquetas}}} {r.bytes}" for r in rutas]
+
+    lineas.append("# TYPE terrigov_websockets_activos gauge")
+    lineas.append(f'terrigov_websockets_activos{{worker="{_WORKER}"}} {_websockets}')
+
+    lineas.append("# TYPE terrigov_evento_segundos histogram")
+    for nombre, histograma in (*_eventos.items(), ("otro", _eventos_otros)):
+        lineas += histograma.lineas("terrigov_evento_segundos", f'worker="{_WORKER}",manejador="{nombre}"')
+
+    lineas.append("# TYPE terrigov_arranque_segundos gauge")
+    lineas.append(f'terrigov_arranque_segundos{{worker="{_WORKER}"}} {arranque_s:.3f}')
+    lineas.append("# TYPE terrigov_seccion_construccion_segundos gauge")
+    for seccion, (origen, ms) in secciones.TIEMPOS.items():
+        lineas.append(
+            f'terrigov_seccion_construccion_segundos{{worker="{_WORKER}",seccion="{seccion}",origen="{origen}"}} {ms / 1000:.4f}'
+        )
+
+    lineas.append("# TYPE terrigov_rss_bytes gauge")
+    lineas.append(f'terrigov_rss_bytes{{worker="{_WORKER}"}} {_PROCESO.memory_info().rss}')
+    return "\n".join(lineas) + "\n"
+
+
+async def _responder_metricas(scope, send) -> None:
+    if not permitido(scope):
+        await send({"type": "http.response.start", "status": 404, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+        return
+    await send({"type": "http.response.start", "status": 200, "headers": [
+        (b"content-type", b"text/plain; version=0.0.4; charset=utf-8"), (b"cache-control", b"no-store"),
+    ]})
+    await send({"type": "http.response.body", "body": exposicion().encode()})
+
+
+def instrumentar(app):
+    """api_transformer de Reflex: mide el backend, cuenta websockets y sirve /metrics"""
+
+    async def asgi(scope, receive, send):
+        global _websockets
+        if scope["type"] == "websocket":
+            _websockets += 1
+            try:
+                await app(scope, receive, send)
+            finally:
+                _websockets -= 1
+        elif scope["type"] != "http":
+            await app(scope, receive, send)
+        elif scope["path"] == RUTA:
+            await medir(DINAMICAS[RUTA], lambda s, r, e: _responder_metricas(s, e), scope, receive, send)
+        else:
+            await medir(clasificar(scope["path"]), app, scope, receive, send)
+
+    return asgi
+
+
+class LatenciaEventos(Middleware):
+    """Middleware de Reflex: tiempo desde que llega un evento hasta su última actualización
+
+    Va después de HydrateMiddleware, que responde la hidratación sin pasar por
+    el manejador; se miden solo los eventos que ejecutan código de la app.
+    """
+
+    def __init__(self):
+        self.inicios: dict[int, float] = {}
+
+    async def preprocess(self, app, state: BaseState, event: Event) -> StateUpdate | None:
+        if len(self.inicios) >= MAX_EN_CURSO:
+            self.inicios.clear()
+        self.inicios[id(event)] = time.perf_counter()
+        return None
+
+    async def postprocess(self, app, state: BaseState, event: Event, update: StateUpdate) -> StateUpdate:
+        if update.final and (inicio := self.inicios.pop(id(event), None)) is not None:
+            histograma = _eventos.get(event.name)
+            if histograma is None:
+                if len(_eventos) < MAX_MANEJADORES:
+                    histograma = _eventos[event.name] = Histograma()
+                else:
+                    histograma = _eventos_otros
+            histograma.observar(time.perf_counter() - inicio)
+        return update
@@ -0,0 +1 @@
+"""Herramientas locales de medición de rendimiento"""
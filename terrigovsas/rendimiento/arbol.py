@@ -0,0 +1,195 @@
+"""Análisis del árbol de componentes de cada sección de la página.
+
+Por sección mide nodos (elementos y textos), profundidad máxima y bytes de
+props del JSX, y señala:
+- subárboles ocultos con `display: none` en algún breakpoint (se envían e
+  hidratan aunque no se vean);
+- subárboles duplicados: idénticos, o con la misma estructura y distinto
+  contenido (candidatos a una función auxiliar o a `rx.foreach`).
+
+Se analizan las funciones de sección sin la caché de `@seccion`, así que el
+resultado no depende de lo que haya en `.cache/`. Las dos ramas de un
+`rx.cond` cuentan. Con `--umbrales` termina con código 1 si se excede algún
+límite de la clave "arbol" de presupuesto.json; los límites son los del
+árbol de producción (REFLEX_ENV_MODE=prod), donde cada icono es `<svg><use>`.
+
+Uso: `python -m terrigovsas.rendimiento.arbol [--umbrales] [--salida r.json]`
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+from tabulate import tabulate
+
+from terrigovsas.rendimiento.presupuesto import PRESUPUESTO, excesos
+
+# Subárboles más pequeños no se consideran duplicados
+MIN_DUPLICADO = 4
+
+# Ancho mínimo de cada breakpoint de Reflex
+BREAKPOINTS = {"0px": "initial", "30em": "xs", "48em": "sm", "62em": "md", "80em": "lg", "96em": "xl"}
+
+_MEDIA = re.compile(r'\["@media screen and \(min-width: ([^)]+)\)"\] : \(\{[^{}]*\["display"\] : "none"')
+_OCULTO_SIEMPRE = re.compile(r'^css:\(\{ \["display"\] : "none"')
+
+
+class Nodo:
+    """Nodo renderizado con sus medidas y huellas"""
+
+    __slots__ = ("nombre", "texto", "props", "hijos", "padre", "nodos", "profundidad", "props_bytes", "huella", "forma")
+
+    def __init__(self, render: dict, padre: "Nodo | None" = None):
+        self.nombre = render.get("name", "").strip('"')
+        self.texto = render.get("contents", "")
+        self.props = render.get("props") or []
+        self.padre = padre
+        ramas = [render[clave] for clave in ("true_value", "false_value") if isinstance(render.get(clave), dict)]
+        self.hijos = [Nodo(hijo, self) for hijo in (*render.get("children", ()), *ramas)]
+        self.props_bytes = sum(len(prop.encode()) for prop in self.props)
+
+        es_elemento = self.nombre not in ("", "Fragment")
+        es_texto = not self.nombre and bool(self.texto)
+        self.nodos = int(es_elemento or es_texto) + sum(hijo.nodos for hijo in self.hijos)
+        self.profundidad = int(es_elemento) + max((hijo.profundidad for hijo in self.hijos), default=0)
+        self.huella = _hash(json.dumps(render, sort_keys=True, default=str))
+        # La forma ignora valores, textos y qué icono es: solo etiquetas, nombres de props y anidamiento
+        nombres = sorted(prop.split(":", 1)[0] for prop in self.props)
+        etiqueta = "Lucide" if self.nombre.startswith("Lucide") else self.nombre
+        self.forma = _hash(f"{etiqueta}|{nombres}|{[hijo.forma for hijo in self.hijos]}")
+
+    def recorrer(self):
+        yield self
+        for hijo in self.hijos:
+            yield from hijo.recorrer()
+
+    def muestra(self) -> str:
+        """Primer texto del subárbol, para reconocerlo en el informe"""
+        for nodo in self.recorrer():
+            if nodo.texto.startswith('"'):
+                return json.loads(nodo.texto)[:40]
+        return ""
+
+
+def _hash(texto: str) -> str:
+    return hashlib.blake2b(texto.encode(), digest_size=8).hexdigest()
+
+
+def ocultos(raiz: Nodo) -> list[dict]:
+    """Subárboles con display none en algún breakpoint (sin repetir los anidados)"""
+    hallazgos = []
+
+    def visitar(nodo: Nodo) -> None:
+        breakpoints = []
+        for prop in nodo.props:
+            if prop.startswith("css:"):
+                if _OCULTO_SIEMPRE.match(prop):
+                    breakpoints.append("todos")
+                breakpoints += [BREAKPOINTS.get(ancho, ancho) for ancho in _MEDIA.findall(prop)]
+        if breakpoints:
+            hallazgos.append({
+                "elemento": nodo.nombre, "muestra": nodo.muestra(), "nodos": nodo.nodos, "oculto_en": breakpoints,
+            })
+            return
+        for hijo in nodo.hijos:
+            visitar(hijo)
+
+    visitar(raiz)
+    return hallazgos
+
+
+def duplicados(raiz: Nodo) -> list[dict]:
+    """Grupos de subárboles repetidos, solo los más externos de cada repetición"""
+    hallazgos = []
+    for tipo, atributo in (("identico", "huella"), ("estructura", "forma")):
+        grupos: dict[str, list[Nodo]] = {}
+        for nodo in raiz.recorrer():
+            if nodo.nodos >= MIN_DUPLICADO and nodo.nombre not in ("", "Fragment"):
+                grupos.setdefault(getattr(nodo, atributo), []).append(nodo)
+        repetidos = {clave: nodos for clave, nodos in grupos.items() if len(nodos) > 1}
+        for nodos in repetidos.values():
+            # Si todos los padres también se repiten, el grupo ya está contado más arriba
+            if all(n.padre is not None and getattr(n.padre, atributo) in repetidos for n in nodos):
+                continue
+            if tipo == "estructura" and len({n.huella for n in nodos}) == 1:
+                continue
+            hallazgos.append({
+                "tipo": tipo,
+                "elemento": nodos[0].nombre,
+                "copias": len(nodos),
+                "nodos_por_copia": nodos[0].nodos,
+                "muestras": list(dict.fromkeys(n.muestra() for n in nodos)),
+            })
+    return hallazgos
+
+
+def analizar(componente) -> dict:
+    """Medidas y hallazgos del árbol de un componente"""
+    raiz = Nodo(componente.render())
+    hallazgos_ocultos = ocultos(raiz)
+    hallazgos_duplicados = duplicados(raiz)
+    return {
+        "nodos": raiz.nodos,
+        "profundidad": raiz.profundidad,
+        "props_bytes": sum(nodo.props_bytes for nodo in raiz.recorrer()),
+        "nodos_ocultos": sum(h["nodos"] for h in hallazgos_ocultos),
+        "nodos_duplicados": sum(h["nodos_por_copia"] * (h["copias"] - 1) for h in hallazgos_duplicados),
+        "ocultos": hallazgos_ocultos,
+        "duplicados": hallazgos_duplicados,
+    }
+
+
+def analizar_pagina() -> dict:
+    """Análisis de cada sección de la página principal y el total"""
+    from terrigovsas import secciones
+    from terrigovsas import terrigovsas  # noqa: F401  (registra las secciones)
+
+    resultado = {nombre: analizar(funcion()) for nombre, funcion in secciones.SECCIONES.items()}
+    numericas = ("nodos", "props_bytes", "nodos_ocultos", "nodos_duplicados")
+    total = {clave: sum(seccion[clave] for seccion in resultado.values()) for clave in numericas}
+    total["profundidad"] = max(seccion["profundidad"] for seccion in resultado.values())
+    return {"total": total, "secciones": resultado}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--umbrales", action="store_true", help="fallar si se excede presupuesto.json")
+    parser.add_argument("--salida", type=Path, help="escribir los resultados en JSON")
+    args = parser.parse_args(argv)
+
+    resultado = analizar_pagina()
+    columnas = ("nodos", "profundidad", "props_bytes", "nodos_ocultos", "nodos_duplicados")
+    filas = [(nombre, *(s[c] for c in columnas)) for nombre, s in resultado["secciones"].items()]
+    filas.append(("total", *(resultado["total"][c] for c in columnas)))
+    print(tabulate(filas, headers=["sección", *columnas]))
+
+    for nombre, seccion in resultado["secciones"].items():
+        for h in seccion["ocultos"]:
+            print(f"\n{nombre}: {h['elemento']} ({h['nodos']} nodos, «{h['muestra']}») oculto en {', '.join(h['oculto_en'])}", end="")
+        for h in seccion["duplicados"]:
+            print(
+                f"\n{nombre}: {h['copias']}× {h['elemento']} de {h['nodos_por_copia']} nodos ({h['tipo']}): "
+                + " / ".join(f"«{m}»" for m in h["muestras"]),
+                end="",
+            )
+    print()
+
+    if args.salida:
+        args.salida.write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    if not args.umbrales:
+        return 0
+    fallos = excesos(resultado, json.loads(PRESUPUESTO.read_text(encoding="utf-8")).get("arbol", {}))
+    if fallos:
+        print("\nUmbrales excedidos:")
+        print(tabulate(fallos, headers=["métrica", "medido", "límite"]))
+        return 1
+    print("\nDentro de los umbrales")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""Prueba del state.js parcheado por `terrigovsas.conexion`, ejecutado en Node.
+
+El benchmark de conexiones habla Socket.IO desde Python y no ejecuta el
+runtime del navegador: no ve si el bucle de eventos de Reflex se queda
+girando en una página que no conecta. Esta prueba carga el state.js
+parcheado con dobles mínimos de React, React Router y socket.io-client,
+monta `useEventLoop` con el evento de hidratado de Reflex y comprueba, por
+modo de conexión:
+
+- que el bucle principal termina (si gira en microtareas, el temporizador
+  que cierra la prueba no llega a dispararse y Node agota el tiempo);
+- cuántos websockets se abren al cargar y tras el primer evento del usuario.
+
+Uso: `python -m terrigovsas.rendimiento.bucle` (requiere `node` en el PATH)
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from terrigovsas.conexion import DIFERIDA, INMEDIATA, SIN_ESTADO, parchear_state_js
+
+# Segundos que puede tardar una ruta antes de dar el bucle por bloqueado
+TIMEOUT = 10
+
+# Lo que debe ocurrir en cada modo: websockets al cargar y tras un evento
+ESPERADO = {
+    INMEDIATA: {"al_cargar": 1, "tras_evento": 1},
+    DIFERIDA: {"al_cargar": 0, "tras_evento": 1},
+    SIN_ESTADO: {"al_cargar": 0, "tras_evento": 0},
+}
+
+# Dobles de los módulos que importa state.js: especificador -> código
+DOBLES = {
+    "socket.io-client": """
+export default function io() {
+  const socket = {
+    emitidos: [], connected: false, io: { encoder: {}, decoder: {} },
+    on() {}, connect() {}, disconnect() {},
+    emit(_, evento) { this.emitidos.push(evento.name); },
+  };
+  globalThis.sockets.push(socket);
+  return socket;
+}
+""",
+    "json5": "export default JSON;",
+    "$/env.json": 'export default { EVENT: "http://localhost:8000/_event", UPLOAD: "http://localhost:8000/_upload" };',
+    "$/reflex.json": 'export default { version: "prueba" };',
+    "universal-cookie": "export default class Cookies { get() {} set() {} remove() {} }",
+    "react": """
+export const useCallback = (funcion) => funcion;
+export const useEffect = (efecto) => { efecto(); };
+export const useRef = (valor) => ({ current: valor });
+export const useState = (valor) => [valor, () => {}];
+""",
+    "react-router": """
+export const useLocation = () => ({ pathname: window.location.pathname, search: "", hash: "" });
+export const useNavigate = () => () => {};
+export const useSearchParams = () => [new URLSearchParams()];
+export const useParams = () => ({});
+""",
+    "$/utils/context": """
+export const initialEvents = () => [];
+export const initialState = { "reflex___state____state": {}, "reflex___state____state.formulario": {} };
+export const onLoadInternalEvent = () => [];
+export const state_name = "reflex___state____state";
+export const exception_state_name = "reflex___state____state.frontend_event_exception_state";
+""",
+    "$/utils/helpers/debounce": "export default (_, funcion) => funcion();",
+    "$/utils/helpers/throttle": "export default () => true;",
+}
+
+CARGADOR = """
+const DOBLES = __DOBLES__;
+export async function resolve(especificador, contexto, siguiente) {
+  if (especificador in DOBLES) {
+    return { url: new URL(DOBLES[especificador], import.meta.url).href, shortCircuit: true };
+  }
+  return siguiente(especificador, contexto);
+}
+"""
+
+PRUEBA = """
+import { register } from "node:module";
+register("./cargador.mjs", import.meta.url);
+
+const almacen = new Map();
+globalThis.sockets = [];
+globalThis.window = {
+  location: { pathname: process.argv[2], search: "", hash: "" },
+  addEventListener() {}, removeEventListener() {},
+  sessionStorage: { getItem: (k) => almacen.get(k) ?? null, setItem: (k, v) => almacen.set(k, v) },
+};
+globalThis.document = { cookie: "", addEventListener() {}, removeEventListener() {} };
+
+const { useEventLoop, Event } = await import("./state.js");
+const tick = () => new Promise((resolver) => setTimeout(resolver, 0));
+
+const [addEvents] = useEventLoop({}, () => [Event("reflex___state____state.hydrate")]);
+await tick();
+const alCargar = sockets.length;
+addEvents([Event("reflex___state____state.formulario.enviar")]);
+await tick();
+console.log(JSON.stringify({
+  al_cargar: alCargar,
+  tras_evento: sockets.length,
+  emitidos: sockets.flatMap((socket) => socket.emitidos),
+}));
+"""
+
+
+class BucleBloqueadoError(RuntimeError):
+    """El bucle de eventos del runtime parcheado no termina en una ruta"""
+
+
+def ejecutar(codigo: str, ruta: str) -> dict:
+    """Monta useEventLoop del state.js `codigo` en `ruta` y devuelve lo que hizo"""
+    with tempfile.TemporaryDirectory() as carpeta:
+        carpeta = Path(carpeta)
+        (carpeta / "package.json").write_text('{"type": "module"}', encoding="utf-8")
+        (carpeta / "state.js").write_text(codigo, encoding="utf-8")
+        archivos = {}
+        for indice, (especificador, doble) in enumerate(DOBLES.items()):
+            archivos[especificador] = f"./doble{indice}.js"
+            (carpeta / f"doble{indice}.js").write_text(doble, encoding="utf-8")
+        (carpeta / "cargador.mjs").write_text(CARGADOR.replace("__DOBLES__", json.dumps(archivos)), encoding="utf-8")
+        (carpeta / "prueba.mjs").write_text(PRUEBA, encoding="utf-8")
+        try:
+            salida = subprocess.run(
+                ["node", "prueba.mjs", ruta], cwd=carpeta, capture_output=True, text=True, timeout=TIMEOUT,
+            )
+        except subprocess.TimeoutExpired as error:
+            raise BucleBloqueadoError(f"el bucle de eventos no termina en {ruta}") from error
+    if salida.returncode:
+        raise RuntimeError(f"node falló en {ruta}:\n{salida.stderr}")
+    return json.loads(salida.stdout)
+
+
+def comprobar() -> dict[str, dict]:
+    """Resultado por modo; falla si alguno no abre los websockets esperados"""
+    rutas = {INMEDIATA: "/inmediata", DIFERIDA: "/", SIN_ESTADO: "/servicios/prueba"}
+    codigo = parchear_state_js(
+        [("^/$", DIFERIDA), ("^/inmediata/?$", INMEDIATA), ("^/servicios/prueba/?$", SIN_ESTADO)], SIN_ESTADO
+    )
+    resultado = {modo: ejecutar(codigo, ruta) for modo, ruta in rutas.items()}
+    for modo, esperado in ESPERADO.items():
+        obtenido = {clave: resultado[modo][clave] for clave in esperado}
+        if obtenido != esperado:
+            raise AssertionError(f"modo {modo}: se esperaba {esperado} y se obtuvo {obtenido}")
+    return resultado
+
+
+if __name__ == "__main__":
+    if shutil.which("node") is None:
+        sys.exit("Hace falta node en el PATH")
+    for modo, fila in comprobar().items():
+        print(f"{modo}: {fila['al_cargar']} websocket al cargar, {fila['tras_evento']} tras un evento, "
+              f"emitidos {fila['emitidos']}")
@@ -0,0 +1,217 @@
+"""Prueba de carga offline contra una instancia local del servidor de producción.
+
+Cada visitante virtual repite visitas durante `--duracion` segundos:
+- nuevo: pide `/` y después los recursos que enlaza el HTML (bundle, CSS,
+  logo.png, favicon.ico...), como un navegador con la caché vacía;
+- recurrente: solo pide `/` (el resto ya está en su caché);
+- con websocket: además abre el canal de eventos y se hidrata.
+
+Mide rendimiento, latencias p50/p95/p99 y errores por tipo de petición, y
+el RSS del servidor a lo largo de la prueba. Con `--salida` escribe el
+resultado en JSON para comparar tamaños de instancia y modos de servidor.
+El generador corre en la misma máquina y compite por CPU con el servidor:
+las cifras sirven para comparar configuraciones entre sí, no como techo.
+
+Uso: `python -m terrigovsas.rendimiento.carga [--visitantes 50] [--duracion 30]
+[--workers 1] [--recurrentes 0.5] [--websocket 0.1] [--salida r.json]`
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import platform
+import random
+import statistics
+import time
+from pathlib import Path
+
+import httpx
+from tabulate import tabulate
+
+from terrigovsas.build.export import DIST_DIR
+from terrigovsas.rendimiento.conexiones import HOST, arrancar, puerto_libre, uso
+from terrigovsas.rendimiento.presupuesto import Referencias
+from terrigovsas.rendimiento.ws import ClienteSocketIO
+from terrigovsas.servidor import nucleos
+
+# Recursos que pide un navegador aunque el HTML no los enlace
+SIEMPRE = ("/favicon.ico", "/logo.png")
+
+CABECERAS = {"accept-encoding": "br, gzip", "user-agent": "terrigovsas-carga"}
+
+# Segundos que espera cada petición o paso del websocket antes de contarlo como error
+TIMEOUT = 10
+
+
+class Registro:
+    """Latencias y errores por tipo de petición"""
+
+    def __init__(self):
+        self.latencias: dict[str, list[float]] = {}
+        self.errores: dict[str, int] = {}
+
+    def anotar(self, tipo: str, segundos: float, error: bool) -> None:
+        self.latencias.setdefault(tipo, []).append(segundos)
+        self.errores[tipo] = self.errores.get(tipo, 0) + error
+
+    def resumen(self, duracion: float) -> dict:
+        por_tipo = {}
+        for tipo, latencias in sorted(self.latencias.items()):
+            cuantiles = statistics.quantiles(latencias, n=100) if len(latencias) > 1 else latencias * 99
+            por_tipo[tipo] = {
+                "peticiones": len(latencias),
+                "por_segundo": round(len(latencias) / duracion, 1),
+                "errores": self.errores[tipo],
+                "p50_ms": round(cuantiles[49] * 1000, 2),
+                "p95_ms": round(cuantiles[94] * 1000, 2),
+                "p99_ms": round(cuantiles[98] * 1000, 2),
+            }
+        total = sum(fila["peticiones"] for fila in por_tipo.values())
+        errores = sum(fila["errores"] for fila in por_tipo.values())
+        return {
+            "peticiones": total,
+            "por_segundo": round(total / duracion, 1),
+            "tasa_error": round(errores / total, 4) if total else 0.0,
+            "por_tipo": por_tipo,
+        }
+
+
+async def recursos(http: httpx.AsyncClient) -> list[str]:
+    """URLs locales que un visitante nuevo pide después de `/`"""
+    respuesta = await http.get("/")
+    respuesta.raise_for_status()
+    parser = Referencias()
+    parser.feed(respuesta.text)
+    locales = (url.split("?")[0] for url in parser.urls if url.startswith("/") and not url.startswith("//"))
+    return list(dict.fromkeys((*locales, *SIEMPRE)))
+
+
+async def pedir(http: httpx.AsyncClient, registro: Registro, tipo: str, url: str) -> None:
+    inicio = time.perf_counter()
+    try:
+        respuesta = await http.get(url)
+        error = respuesta.status_code >= 400
+    except httpx.HTTPError:
+        error = True
+    registro.anotar(tipo, time.perf_counter() - inicio, error)
+
+
+async def conectar(puerto: int, registro: Registro) -> None:
+    inicio = time.perf_counter()
+    cliente = None
+    try:
+        cliente = await asyncio.wait_for(ClienteSocketIO.conectar(HOST, puerto), TIMEOUT)
+        await asyncio.wait_for(cliente.hidratar(), TIMEOUT)
+        error = False
+    except (TimeoutError, ConnectionError, OSError, ValueError):
+        error = True
+    registro.anotar("websocket", time.perf_counter() - inicio, error)
+    if cliente is not None:
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(cliente.cerrar(), TIMEOUT)
+
+
+async def visitante(
+    puerto: int, urls: list[str], args: argparse.Namespace, azar: random.Random, fin: float, registro: Registro
+) -> None:
+    """Un visitante virtual: visitas seguidas hasta `fin` con conexiones keep-alive, como una pestaña"""
+    async with httpx.AsyncClient(
+        base_url=f"http://{HOST}:{puerto}", headers=CABECERAS, trust_env=False, timeout=TIMEOUT
+    ) as http:
+        while time.perf_counter() < fin:
+            await pedir(http, registro, "html", "/")
+            if azar.random() >= args.recurrentes:
+                # El navegador pide los subrecursos en paralelo
+                await asyncio.gather(*(pedir(http, registro, "recurso", url) for url in urls))
+            if azar.random() < args.websocket:
+                await conectar(puerto, registro)
+
+
+async def rss_periodico(proceso, inicio: float, muestras: list, intervalo: float) -> None:
+    while True:
+        rss, _ = await asyncio.to_thread(uso, proceso)
+        muestras.append((round(time.perf_counter() - inicio, 1), round(rss / 2**20, 1)))
+        await asyncio.sleep(intervalo)
+
+
+async def campana(args: argparse.Namespace) -> dict:
+    """Arranca el servidor, lo calienta, lanza la carga y devuelve el resultado"""
+    puerto = puerto_libre()
+    proceso = arrancar(args.dist, puerto, args.workers)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://{HOST}:{puerto}", trust_env=False) as http:
+            urls = await recursos(http)
+        azar = random.Random(args.semilla)
+
+        # Calentamiento: no cuenta para el resultado
+        fin = time.perf_counter() + args.calentamiento
+        await asyncio.gather(*(
+            visitante(puerto, urls, args, random.Random(azar.random()), fin, Registro())
+            for _ in range(args.visitantes)
+        ))
+
+        registro, muestras = Registro(), []
+        inicio = time.perf_counter()
+        muestreo = asyncio.create_task(rss_periodico(proceso, inicio, muestras, args.muestreo))
+        await asyncio.gather(*(
+            visitante(puerto, urls, args, random.Random(azar.random()), inicio + args.duracion, registro)
+            for _ in range(args.visitantes)
+        ))
+        duracion = time.perf_counter() - inicio
+        muestreo.cancel()
+        rss, _ = uso(proceso)
+        muestras.append((round(duracion, 1), round(rss / 2**20, 1)))
+    finally:
+        proceso.terminate()
+        proceso.wait(timeout=30)
+
+    return {
+        "configuracion": {
+            "etiqueta": args.etiqueta,
+            "visitantes": args.visitantes,
+            "duracion_s": args.duracion,
+            "workers": args.workers,
+            "recurrentes": args.recurrentes,
+            "websocket": args.websocket,
+            "semilla": args.semilla,
+            "recursos": urls,
+            "nucleos": nucleos(),
+            "python": platform.python_version(),
+        },
+        **registro.resumen(duracion),
+        "rss_mb": muestras,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--visitantes", type=int, default=50, help="visitantes virtuales concurrentes")
+    parser.add_argument("--duracion", type=float, default=30.0, help="segundos de carga medida")
+    parser.add_argument("--calentamiento", type=float, default=3.0, help="segundos de carga sin medir")
+    parser.add_argument("--workers", type=int, default=1, help="WEB_CONCURRENCY del servidor")
+    parser.add_argument("--recurrentes", type=float, default=0.5, help="fracción de visitas con caché")
+    parser.add_argument("--websocket", type=float, default=0.0, help="fracción de visitas que abren el canal de eventos")
+    parser.add_argument("--muestreo", type=float, default=1.0, help="segundos entre muestras de RSS")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--etiqueta", default="", help="nombre de la campaña en el JSON (p. ej. railway-1vcpu)")
+    parser.add_argument("--dist", type=Path, default=DIST_DIR)
+    parser.add_argument("--salida", type=Path, help="escribe el resultado en JSON")
+    args = parser.parse_args()
+
+    resultado = asyncio.run(campana(args))
+    print(tabulate(
+        [(tipo, *fila.values()) for tipo, fila in resultado["por_tipo"].items()],
+        headers=["tipo", *next(iter(resultado["por_tipo"].values())).keys()],
+    ))
+    rss = [mb for _, mb in resultado["rss_mb"]]
+    print(
+        f"\n{resultado['por_segundo']} peticiones/s, tasa de error {resultado['tasa_error']:.2%}, "
+        f"RSS {min(rss)}–{max(rss)} MB"
+    )
+    if args.salida:
+        args.salida.write_text(json.dumps(resultado, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
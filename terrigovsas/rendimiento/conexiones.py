@@ -0,0 +1,151 @@
+"""Benchmark de memoria y descriptores del backend por visitantes concurrentes.
+
+Compara un visitante con conexión "inmediata" (websocket + hidratación, lo que
+hace Reflex por defecto) contra lo que hace el cliente compilado en `/`: el
+modo se lee de `MODOS_CONEXION` en el bundle exportado, así que si la página
+principal vuelve a conectar al cargar, el segundo escenario también abre el
+websocket. Cada escenario arranca su propio servidor y el resultado se
+extrapola a 10 000 visitantes.
+
+Uso: `python -m terrigovsas.rendimiento.conexiones [--visitantes 2000] [--dist dist]`
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import psutil
+from tabulate import tabulate
+
+from terrigovsas.build.export import DIST_DIR
+from terrigovsas.conexion import INMEDIATA, MODOS
+from terrigovsas.rendimiento.ws import ClienteSocketIO
+
+HOST = "127.0.0.1"
+
+# Conexiones que se abren en paralelo
+CONCURRENCIA = 200
+
+# Literal de `MODOS_CONEXION` que `terrigovsas.conexion` escribe en state.js
+_MODOS_CONEXION = re.compile(
+    r'\[\s*(?:\[\s*"(?:[^"\\]|\\.)*"\s*,\s*"(?:' + "|".join(MODOS) + r')"\s*\]\s*,?\s*)+\]'
+)
+# Modo de las rutas sin página (`?? "sin_estado"`), justo después del literal
+_POR_DEFECTO = re.compile(r'\?\?\s*"(' + "|".join(MODOS) + r')"')
+
+
+def puerto_libre() -> int:
+    """Puerto TCP libre en localhost"""
+    with socket.socket() as s:
+        s.bind((HOST, 0))
+        return s.getsockname()[1]
+
+
+def arrancar(dist: Path, puerto: int, workers: int = 1) -> subprocess.Popen:
+    """Arranca el servidor de producción con `workers` workers y espera a /ping"""
+    entorno = dict(os.environ, TERRIGOV_DIST=str(dist), PORT=str(puerto), HOST=HOST, WEB_CONCURRENCY=str(workers))
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "terrigovsas.servidor"],
+        env=entorno, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    with httpx.Client(trust_env=False) as cliente:
+        for _ in range(600):
+            try:
+                cliente.get(f"http://{HOST}:{puerto}/ping", timeout=1)
+                return proceso
+            except httpx.TransportError:
+                time.sleep(0.1)
+    proceso.kill()
+    raise RuntimeError("el servidor no respondió a /ping")
+
+
+def modo_compilado(dist: Path, ruta: str = "/") -> str:
+    """Modo de conexión de `ruta` según el runtime exportado en `dist`"""
+    for archivo in sorted(dist.rglob("*.js")):
+        codigo = archivo.read_text(encoding="utf-8", errors="ignore")
+        if literal := _MODOS_CONEXION.search(codigo):
+            for patron, modo in json.loads(literal.group(0)):
+                if re.search(patron, ruta):
+                    return modo
+            por_defecto = _POR_DEFECTO.search(codigo, literal.end())
+            return por_defecto.group(1) if por_defecto else INMEDIATA
+    raise RuntimeError(f"{dist} no tiene MODOS_CONEXION: el runtime no se compiló con ConexionPorPaginaPlugin")
+
+
+def uso(proceso: subprocess.Popen) -> tuple[int, int]:
+    """(RSS en bytes, descriptores abiertos) de los workers del servidor"""
+    workers = psutil.Process(proceso.pid).children(recursive=True) or [psutil.Process(proceso.pid)]
+    return sum(w.memory_info().rss for w in workers), sum(w.num_fds() for w in workers)
+
+
+async def visitar(puerto: int, n: int, con_websocket: bool) -> list[ClienteSocketIO]:
+    """Simula `n` pestañas abiertas a la vez en la página principal"""
+    limite = asyncio.Semaphore(CONCURRENCIA)
+    abiertos = []
+    async with httpx.AsyncClient(base_url=f"http://{HOST}:{puerto}", trust_env=False) as http:
+
+        async def visitante():
+            async with limite:
+                (await http.get("/")).raise_for_status()
+                if con_websocket:
+                    cliente = await ClienteSocketIO.conectar(HOST, puerto)
+                    await cliente.hidratar()
+                    abiertos.append(cliente)
+
+        await asyncio.gather(*(visitante() for _ in range(n)))
+    return abiertos
+
+
+async def escenario(dist: Path, n: int, con_websocket: bool) -> dict:
+    """Memoria y descriptores adicionales con `n` visitantes conectados"""
+    puerto = puerto_libre()
+    proceso = arrancar(dist, puerto)
+    try:
+        rss0, fds0 = uso(proceso)
+        abiertos = await visitar(puerto, n, con_websocket)
+        await asyncio.sleep(1)
+        rss1, fds1 = uso(proceso)
+        for cliente in abiertos:
+            await cliente.cerrar()
+    finally:
+        proceso.terminate()
+        proceso.wait(timeout=30)
+    return {
+        "visitantes": n,
+        "websockets": len(abiertos),
+        "rss_base_mb": round(rss0 / 2**20, 1),
+        "rss_por_10k_mb": round((rss1 - rss0) / n * 10_000 / 2**20, 1),
+        "fds_por_10k": round((fds1 - fds0) / n * 10_000),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--visitantes", type=int, default=2000)
+    parser.add_argument("--dist", type=Path, default=DIST_DIR)
+    parser.add_argument("--salida", type=Path, help="escribe el resultado en JSON")
+    args = parser.parse_args()
+
+    modo = modo_compilado(args.dist)
+    resultado = {
+        f"reflex ({INMEDIATA})": asyncio.run(escenario(args.dist, args.visitantes, con_websocket=True)),
+        f"compilado ({modo})": asyncio.run(escenario(args.dist, args.visitantes, con_websocket=modo == INMEDIATA)),
+    }
+    print(tabulate(
+        [(nombre, *fila.values()) for nombre, fila in resultado.items()],
+        headers=["conexión", *next(iter(resultado.values())).keys()],
+    ))
+    if args.salida:
+        args.salida.write_text(json.dumps(resultado, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Benchmark de peso de página y build, comparado contra presupuesto.json.
+
+Uso: `python -m terrigovsas.rendimiento.presupuesto [--dist dist] [--compilar] [--salida r.json]`
+Por defecto mide el build ya exportado en `--dist`, sin red; con `--compilar`
+ejecuta antes el pipeline de build completo (que sí descarga dependencias) y
+mide también su duración. Termina con código 1 si se excede algún
+presupuesto o si falta alguna métrica presupuestada: una métrica que deja de
+medirse no puede pasar el presupuesto en silencio. Las claves de "rutas"
+admiten patrones (`/servicios/*`) que se aplican a cada página que coincide.
+"""
+
+import argparse
+import fnmatch
+import gzip
+import json
+import subprocess
+import sys
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+
+import brotli
+from tabulate import tabulate
+
+from terrigovsas.build.export import DIST_DIR
+from terrigovsas.estaticos import MANIFIESTO
+
+PRESUPUESTO = Path(__file__).resolve().parents[2] / "presupuesto.json"
+
+# Claves de presupuesto.json que mide este módulo; "arbol" lo mide terrigovsas.rendimiento.arbol
+PROPIAS = ("total", "rutas")
+
+# Categoría de cada extensión
+CATEGORIAS = {
+    ".js": "js", ".mjs": "js",
+    ".css": "css",
+    ".html": "html",
+    ".png": "img", ".jpg": "img", ".jpeg": "img", ".webp": "img", ".avif": "img",
+    ".svg": "img", ".ico": "img", ".gif": "img",
+    ".woff2": "fuentes", ".woff": "fuentes",
+}
+
+
+def tamanos(datos: bytes) -> dict[str, int]:
+    """Bytes sin comprimir, con gzip y con brotli al nivel máximo"""
+    return {
+        "raw": len(datos),
+        "gzip": len(gzip.compress(datos, compresslevel=9, mtime=0)),
+        "brotli": len(brotli.compress(datos, quality=11)),
+    }
+
+
+def sumar(total: dict[str, int], parcial: dict[str, int]) -> None:
+    for clave, valor in parcial.items():
+        total[clave] = total.get(clave, 0) + valor
+
+
+class Referencias(HTMLParser):
+    """Recursos que el HTML pide al cargar (scripts, hojas, precargas, imágenes)"""
+
+    ATRIBUTOS = {"script": "src", "link": "href", "img": "src", "source": "srcset"}
+
+    def __init__(self):
+        super().__init__()
+        self.urls: list[str] = []
+        # Hojas que bloquean el primer pintado (las de media="print" no)
+        self.bloqueantes = 0
+        # Con JavaScript activo no se pide nada de lo que va en <noscript>
+        self._noscript = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "noscript" or self._noscript:
+            self._noscript = True
+            return
+        if tag == "link" and attrs.get("rel") == "stylesheet" and attrs.get("media", "all") in ("all", "screen"):
+            self.bloqueantes += 1
+        if tag == "link" and attrs.get("rel") not in (
+            "stylesheet", "modulepreload", "preload", "icon", "shortcut icon", "manifest",
+        ):
+            return
+        valor = attrs.get(self.ATRIBUTOS.get(tag, ""))
+        if tag == "img" and attrs.get("srcset"):
+            # El navegador pide una sola variante: se toma la primera
+            valor = attrs["srcset"].split(",")[0].split()[0]
+        elif tag == "source":
+            return
+        if valor:
+            self.urls.append(valor)
+
+    def handle_endtag(self, tag):
+        if tag == "noscript":
+            self._noscript = False
+
+
+def medir_sitio(dist: Path) -> dict:
+    """Bytes por categoría de todo el sitio y de cada ruta, y peticiones por ruta"""
+    manifiesto = dist / MANIFIESTO
+    # Los originales con copia con hash no se sirven a la página: no cuentan
+    duplicados = set()
+    if manifiesto.exists():
+        duplicados = set(json.loads(manifiesto.read_text(encoding="utf-8"))["renombrados"])
+
+    totales: dict[str, dict[str, int]] = {}
+    medidas: dict[str, tuple[str, dict[str, int]]] = {}
+    for archivo in sorted(dist.rglob("*")):
+        categoria = CATEGORIAS.get(archivo.suffix)
+        ruta = "/" + archivo.relative_to(dist).as_posix()
+        if archivo.is_file() and categoria:
+            medidas[ruta] = categoria, tamanos(archivo.read_bytes())
+            if ruta not in duplicados:
+                sumar(totales.setdefault(categoria, {}), medidas[ruta][1])
+
+    rutas = {}
+    for html in sorted(dist.rglob("index.html")):
+        ruta = "/" + html.parent.relative_to(dist).as_posix().strip(".")
+        parser = Referencias()
+        parser.feed(html.read_text(encoding="utf-8"))
+        locales = dict.fromkeys(u.split("?")[0] for u in parser.urls if u.startswith("/"))
+        externas = [u for u in parser.urls if u.startswith(("http://", "https://", "//"))]
+        peso: dict[str, dict[str, int]] = {}
+        for url in ["/" + html.relative_to(dist).as_posix(), *locales]:
+            if url in medidas:
+                categoria, tamano = medidas[url]
+                sumar(peso.setdefault(categoria, {}), tamano)
+                sumar(peso.setdefault("total", {}), tamano)
+        rutas[ruta.rstrip("/") or "/"] = {
+            "peticiones": 1 + len(locales) + len(externas),
+            "externas": len(externas),
+            "css_bloqueante": parser.bloqueantes,
+            **peso,
+        }
+    return {"total": totales, "rutas": rutas}
+
+
+def compilar(dist: Path) -> float:
+    """Ejecuta el pipeline de build completo y devuelve el tiempo de pared"""
+    inicio = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "terrigovsas.build", str(dist)], check=True)
+    return time.perf_counter() - inicio
+
+
+def excesos(resultado: dict, presupuesto: dict, prefijo: str = "") -> list[tuple]:
+    """Compara recursivamente y devuelve (métrica, medido, límite) de lo que excede o falta"""
+    filas = []
+    for clave, limite in presupuesto.items():
+        medido = resultado.get(clave) if isinstance(resultado, dict) else None
+        nombre = f"{prefijo}{clave}"
+        if isinstance(limite, dict):
+            filas.extend(excesos(medido if isinstance(medido, dict) else {}, limite, f"{nombre}."))
+        elif medido is None:
+            filas.append((nombre, "sin medir", limite))
+        elif medido > limite:
+            filas.append((nombre, medido, limite))
+    return filas
+
+
+def expandir(limites: dict, rutas: dict) -> dict:
+    """Presupuesto por ruta con los patrones (`/servicios/*`) aplicados a cada ruta medida.
+
+    Un patrón que no coincide con ninguna ruta se conserva tal cual y sale como
+    "sin medir"; un límite escrito para una ruta concreta manda sobre el patrón.
+    """
+    expandidos = {}
+    for patron, limite in limites.items():
+        coincidencias = [ruta for ruta in rutas if fnmatch.fnmatchcase(ruta, patron)] if "*" in patron else []
+        for ruta in coincidencias or [patron]:
+            expandidos.setdefault(ruta, limite)
+    return {**expandidos, **{ruta: limite for ruta, limite in limites.items() if "*" not in ruta}}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dist", type=Path, default=DIST_DIR)
+    parser.add_argument("--compilar", action="store_true", help="ejecutar antes el build completo (requiere red)")
+    parser.add_argument("--salida", type=Path, help="escribir los resultados en JSON")
+    args = parser.parse_args(argv)
+
+    resultado = {}
+    if args.compilar:
+        resultado["compilacion_s"] = round(compilar(args.dist), 2)
+    elif not (args.dist / "index.html").is_file():
+        parser.error(f"{args.dist} no tiene un build exportado; usa --compilar o `python -m terrigovsas.build`")
+    resultado.update(medir_sitio(args.dist))
+
+    filas = [("sitio", cat, *t.values()) for cat, t in resultado["total"].items()]
+    for ruta, medida in resultado["rutas"].items():
+        filas += [(ruta, cat, *t.values()) for cat, t in medida.items() if isinstance(t, dict)]
+        print(f"{ruta}: {medida['peticiones']} peticiones ({medida['externas']} externas)")
+    print(tabulate(filas, headers=["ámbito", "categoría", "raw", "gzip", "brotli"]))
+    if "compilacion_s" in resultado:
+        print(f"\nCompilación: {resultado['compilacion_s']} s")
+
+    if args.salida:
+        args.salida.write_text(json.dumps(resultado, indent=2), encoding="utf-8")
+
+    presupuesto = json.loads(PRESUPUESTO.read_text(encoding="utf-8"))
+    # La duración del build solo se presupuesta cuando se compila
+    propias = (*PROPIAS, "compilacion_s") if args.compilar else PROPIAS
+    presupuesto["rutas"] = expandir(presupuesto.get("rutas", {}), resultado["rutas"])
+    fallos = excesos(resultado, {clave: presupuesto[clave] for clave in propias if clave in presupuesto})
+    if fallos:
+        print("\nPresupuesto excedido:")
+        print(tabulate(fallos, headers=["métrica", "medido", "límite"]))
+        return 1
+    print("\nDentro del presupuesto")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Cliente mínimo de Socket.IO sobre websocket (asyncio + wsproto) para benchmarks.
+
+Habla lo justo del protocolo Engine.IO v4 / Socket.IO v5 para imitar a un
+navegador de Reflex: abrir el websocket, unirse al namespace de eventos,
+enviar eventos y responder a los pings del servidor.
+"""
+
+import asyncio
+import json
+import uuid
+
+from reflex.state import State
+from wsproto import ConnectionType, WSConnection
+from wsproto.events import (
+    AcceptConnection,
+    CloseConnection,
+    Message,
+    Ping,
+    RejectConnection,
+    Request,
+    TextMessage,
+)
+
+EVENT_PATH = "/_event/?EIO=4&transport=websocket"
+NAMESPACE = "/_event"
+
+
+class ClienteSocketIO:
+    """Una pestaña del navegador conectada al backend de Reflex"""
+
+    def __init__(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        self.lector = lector
+        self.escritor = escritor
+        self.ws = WSConnection(ConnectionType.CLIENT)
+        self.token = str(uuid.uuid4())
+        self._partes: list[str] = []
+        self._recibidos: list[str] = []
+
+    @classmethod
+    async def conectar(cls, host: str, puerto: int) -> "ClienteSocketIO":
+        """Abre el websocket y se une al namespace de eventos"""
+        cliente = cls(*await asyncio.open_connection(host, puerto))
+        await cliente._escribir(cliente.ws.send(Request(host=f"{host}:{puerto}", target=EVENT_PATH)))
+        aceptado = False
+        while not aceptado:
+            await cliente._leer()
+            # Solo hasta la aceptación: lo que venga detrás lo procesa recibir()
+            for evento in cliente.ws.events():
+                if isinstance(evento, RejectConnection):
+                    raise ConnectionError(f"websocket rechazado: {evento.status_code}")
+                if isinstance(evento, AcceptConnection):
+                    aceptado = True
+                    break
+        await cliente.recibir()  # paquete "open" de Engine.IO
+        await cliente.enviar(f"40{NAMESPACE},")
+        await cliente.esperar(f"40{NAMESPACE},")
+        return cliente
+
+    async def _escribir(self, datos: bytes) -> None:
+        self.escritor.write(datos)
+        await self.escritor.drain()
+
+    async def _leer(self) -> None:
+        datos = await self.lector.read(65536)
+        if not datos:
+            raise ConnectionError("el servidor cerró la conexión")
+        self.ws.receive_data(datos)
+
+    async def enviar(self, texto: str) -> None:
+        """Envía un paquete de texto"""
+        await self._escribir(self.ws.send(Message(data=texto)))
+
+    async def recibir(self) -> str:
+        """Siguiente paquete de texto que no sea un ping"""
+        while not self._recibidos:
+            # Primero lo que wsproto ya tenga en su búfer; solo se lee si no hay nada
+            for evento in self.ws.events():
+                if isinstance(evento, Ping):
+                    await self._escribir(self.ws.send(evento.response()))
+                elif isinstance(evento, CloseConnection):
+                    raise ConnectionError("el servidor cerró el websocket")
+                elif isinstance(evento, TextMessage):
+                    self._partes.append(evento.data)
+                    if evento.message_finished:
+                        paquete, self._partes = "".join(self._partes), []
+                        if paquete == "2":
+                            # ping de Engine.IO
+                            await self.enviar("3")
+                        else:
+                            self._recibidos.append(paquete)
+            if not self._recibidos:
+                await self._leer()
+        return self._recibidos.pop(0)
+
+    async def esperar(self, prefijo: str) -> str:
+        """Descarta paquetes hasta recibir uno que empiece por `prefijo`"""
+        while not (paquete := await self.recibir()).startswith(prefijo):
+            pass
+        return paquete
+
+    async def evento(self, nombre: str, payload: dict | None = None, ruta: str = "/") -> dict:
+        """Envía un evento de Reflex y devuelve la primera actualización"""
+        datos = {
+            "name": nombre,
+            "payload": payload or {},
+            "token": self.token,
+            "router_data": {"pathname": ruta, "query": {}, "asPath": ruta},
+        }
+        await self.enviar(f"42{NAMESPACE},{json.dumps(['event', datos])}")
+        paquete = await self.esperar(f"42{NAMESPACE},")
+        return json.loads(paquete[len(f"42{NAMESPACE},"):])[1]
+
+    async def hidratar(self, ruta: str = "/") -> dict:
+        """Lo que hace el navegador al cargar una página con conexión inmediata"""
+        return await self.evento(f"{State.get_full_name()}.hydrate", ruta=ruta)
+
+    async def cerrar(self) -> None:
+        """Cierra el websocket y el socket TCP"""
+        try:
+            await self._escribir(self.ws.send(CloseConnection(code=1000)))
+        except (ConnectionError, RuntimeError):
+            pass
+        self.escritor.close()
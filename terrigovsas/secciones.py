@@ -0,0 +1,159 @@
+"""Caché en disco de secciones compiladas.
+
+Cada función de sección decorada con `@seccion(...)` es una unidad cacheable:
+su JSX renderizado y sus imports se guardan con una clave que combina el
+código fuente de la función, el de los componentes que usa y los datos de
+los que depende. De los componentes definidos en otro módulo (`icono`,
+`enlace`, `formulario_contacto`...) cuenta el módulo entero, con sus
+constantes y clases, igual que `estilos`, que da forma a todas las
+secciones. Con la caché caliente la sección no se reconstruye.
+"""
+
+import dataclasses
+import hashlib
+import inspect
+import json
+import time
+from functools import wraps
+from pathlib import Path
+from typing import Callable
+
+import reflex as rx
+from reflex import constants
+from reflex.compiler.templates import from_string
+from reflex.components.base.bare import Bare
+from reflex.utils.exec import is_prod_mode
+from reflex.utils.imports import ImportVar
+from reflex.vars.base import Var, VarData
+
+from terrigovsas import estilos
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "secciones"
+
+# Última construcción de cada sección: nombre -> (origen, milisegundos)
+TIEMPOS: dict[str, tuple[str, float]] = {}
+
+# Funciones de sección sin decorar, en orden de definición: nombre -> función
+SECCIONES: dict[str, Callable[[], rx.Component]] = {}
+
+_RENDER_JSX = from_string(
+    "{% import 'web/pages/utils.js.jinja2' as utils %}{{ utils.render(componente) }}"
+)
+
+
+def _serializable(valor):
+    if dataclasses.is_dataclass(valor):
+        return dataclasses.asdict(valor)
+    return str(valor)
+
+
+def clave(funcion: Callable, dependencias: tuple) -> str:
+    """Hash del código de la sección, de sus componentes y de sus datos"""
+    # Algunos componentes (los iconos) se compilan distinto en desarrollo y en producción
+    partes = [constants.Reflex.VERSION, str(is_prod_mode()), inspect.getsource(estilos), inspect.getsource(funcion)]
+    modulos = {estilos.__name__}
+    for dependencia in dependencias:
+        if callable(dependencia):
+            modulo = inspect.getmodule(dependencia)
+            if modulo is None or modulo.__name__ == funcion.__module__:
+                partes.append(inspect.getsource(dependencia))
+            elif modulo.__name__ not in modulos:
+                # Un auxiliar importado depende de todo su módulo, no solo de su función
+                modulos.add(modulo.__name__)
+                partes.append(inspect.getsource(modulo))
+        else:
+            partes.append(json.dumps(dependencia, sort_keys=True, default=_serializable))
+    return hashlib.sha256("\0".join(partes).encode()).hexdigest()[:16]
+
+
+def compilar(componente: rx.Component) -> dict | None:
+    """JSX, imports y hooks de una sección, o None si no es cacheable"""
+    componente._add_style_recursive({})
+    if (
+        componente._get_all_custom_code()
+        or componente._get_all_dynamic_imports()
+        or componente._has_stateful_event_triggers()
+    ):
+        return None
+    return {
+        "jsx": _RENDER_JSX.render(componente=componente.render()).strip(),
+        "imports": {
+            biblioteca: [dataclasses.asdict(i) for i in imports]
+            for biblioteca, imports in componente._get_all_imports().items()
+        },
+        "hooks": list(componente._get_all_hooks()),
+    }
+
+
+def restaurar(compilada: dict) -> rx.Component:
+    """Componente que reproduce una sección compilada sin reconstruir su árbol.
+
+    Los wrappers de app (tema Radix) los aporta el contenedor de la página.
+    """
+    estilos.registrar(compilada["estilos"])
+    imports = {
+        biblioteca: [ImportVar(**i) for i in lista]
+        for biblioteca, lista in compilada["imports"].items()
+    }
+    return Bare.create(
+        Var(
+            _js_expr=compilada["jsx"],
+            _var_data=VarData(imports=imports, hooks=compilada["hooks"]),
+        )
+    )
+
+
+def seccion(*dependencias) -> Callable:
+    """Marca una función de sección como cacheable.
+
+    Las dependencias son los componentes auxiliares que usa (por su código
+    fuente) y los datos de los que depende (por su contenido).
+    """
+
+    def decorador(funcion: Callable[[], rx.Component]) -> Callable[[], rx.Component]:
+        SECCIONES[funcion.__name__] = funcion
+
+        @wraps(funcion)
+        def envoltura() -> rx.Component:
+            inicio = time.perf_counter()
+            archivo = CACHE_DIR / f"{funcion.__name__}-{clave(funcion, dependencias)}.json"
+            # Las versiones anteriores de la sección ya no sirven
+            for anterior in CACHE_DIR.glob(f"{funcion.__name__}-*.json"):
+                if anterior != archivo:
+                    anterior.unlink(missing_ok=True)
+            if archivo.exists():
+                componente = restaurar(json.loads(archivo.read_text(encoding="utf-8")))
+                origen = "caché"
+            else:
+                componente = funcion()
+                reglas = estilos.extraer(componente)
+                compilada = compilar(componente)
+                if compilada is not None:
+                    compilada["estilos"] = reglas
+                    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                    archivo.write_text(json.dumps(compilada), encoding="utf-8")
+                origen = "compilada"
+            TIEMPOS[funcion.__name__] = (origen, (time.perf_counter() - inicio) * 1000)
+            return componente
+
+        return envoltura
+
+    return decorador
+
+
+def informe() -> str:
+    """Tabla con el origen y el tiempo de la última construcción de cada sección"""
+    from tabulate import tabulate
+
+    filas = [(nombre, origen, f"{ms:.1f}") for nombre, (origen, ms) in TIEMPOS.items()]
+    total = sum(ms for _, ms in TIEMPOS.values())
+    return tabulate([*filas, ("total", "", f"{total:.1f}")], headers=["sección", "origen", "ms"])
+
+
+if __name__ == "__main__":
+    # Se usa el módulo importado por la app, no este __main__
+    from terrigovsas import secciones
+    from terrigovsas.terrigovsas import index
+
+    index()
+    print(secciones.informe())
@@ -0,0 +1,94 @@
+"""Punto de entrada de producción: frontend exportado y backend en un solo puerto.
+
+Las rutas del sitio estático se resuelven antes de tocar la app de Reflex, así
+que no pasan por su pila de middleware. El resto (websocket de eventos, ping,
+health, uploads) va al backend. Uso: `python -m terrigovsas.servidor`
+"""
+
+import os
+import time
+from pathlib import Path
+
+from reflex import constants
+
+from terrigovsas import analitica, metricas
+from terrigovsas.estaticos import ServidorEstatico
+
+# Prefijos que atiende el backend de Reflex; lo demás es del sitio estático
+PREFIJOS_BACKEND = (*(str(endpoint) for endpoint in constants.Endpoint), analitica.PREFIJO, metricas.RUTA)
+
+
+class Enrutador:
+    """ASGI que despacha entre el sitio en memoria y el backend de Reflex"""
+
+    def __init__(self, estatico: ServidorEstatico, backend):
+        self.estatico = estatico
+        self.backend = backend
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            ruta = scope["path"]
+            recurso = self.estatico.buscar(ruta)
+            if recurso is not None and scope["method"] in ("GET", "HEAD"):
+                await metricas.medir(metricas.ESTATICO, self._responder(recurso), scope, receive, send)
+                return
+            if not ruta.startswith(PREFIJOS_BACKEND):
+                await metricas.medir(metricas.ESTATICO, self._responder(None), scope, receive, send)
+                return
+        # websocket, lifespan y rutas del backend
+        await self.backend(scope, receive, send)
+
+    def _responder(self, recurso):
+        return lambda scope, receive, send: self.estatico.responder(scope, send, recurso)
+
+
+def crear_app() -> Enrutador:
+    """Fábrica para granian: un enrutador por worker"""
+    from reflex.environment import environment
+
+    # El frontend ya viene compilado en el artefacto; el backend no recompila
+    environment.REFLEX_SKIP_COMPILE.set(True)
+    inicio = time.perf_counter()
+    from terrigovsas.terrigovsas import app
+
+    estatico = ServidorEstatico(Path(os.environ.get("TERRIGOV_DIST", "dist")))
+    enrutador = Enrutador(estatico, app())
+    metricas.arranque_s = time.perf_counter() - inicio
+    return enrutador
+
+
+def nucleos() -> int:
+    """Núcleos disponibles, respetando afinidad y la cuota de CPU del contenedor"""
+    disponibles = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    try:
+        cuota, periodo = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+    except (OSError, ValueError):
+        return disponibles
+    if cuota == "max":
+        return disponibles
+    return max(1, min(disponibles, -(-int(cuota) // int(periodo))))
+
+
+def main() -> None:
+    """Arranca granian con un worker por núcleo (o WEB_CONCURRENCY)"""
+    from granian.constants import Interfaces
+    from granian.server import Server
+
+    workers = int(os.environ.get("WEB_CONCURRENCY", 0)) or nucleos()
+    Server(
+        target="terrigovsas.servidor:crear_app",
+        factory=True,
+        interface=Interfaces.ASGI,
+        address=os.environ.get("HOST", "0.0.0.0"),
+        port=int(os.environ.get("PORT", 3000)),
+        workers=workers,
+        # Un hilo por worker: el paralelismo viene de los procesos
+        runtime_threads=1,
+        log_access=False,
+        # A veces el apagado del lifespan de Reflex no termina bajo granian
+        workers_kill_timeout=10,
+    ).serve()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Solicitudes de contacto: cola en memoria y escritura diferida por lotes en SQLite.
+
+El manejador del formulario solo valida y encola (O(1), sin E/S); una tarea de
+fondo vacía la cola e inserta todo lo acumulado en una sola transacción. La
+cola, el límite por cliente y la deduplicación tienen tamaño máximo, así que
+la memoria queda acotada aunque lleguen más envíos de los que se alcanzan a
+escribir. Cada worker de granian tiene su propia cola y sus propios límites.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import sqlalchemy
+from reflex.utils import console
+from sqlmodel import Field, SQLModel
+
+from terrigovsas import basedatos
+
+# Longitud máxima de cada campo del formulario
+CAMPOS = {"nombre": 120, "entidad": 160, "municipio": 120, "mensaje": 2000}
+# Campos de texto libre: conservan los saltos de línea que escribió el visitante
+MULTILINEA = {"mensaje"}
+
+# Solicitudes pendientes de escribir y tamaño máximo de cada transacción
+MAX_EN_COLA = 10_000
+MAX_LOTE = 1_000
+
+# Cada cliente puede enviar MAX_POR_VENTANA solicitudes cada VENTANA segundos
+VENTANA = 60.0
+MAX_POR_VENTANA = 5
+
+# Una solicitud idéntica dentro de este plazo se considera duplicada
+PLAZO_DUPLICADO = 24 * 3600.0
+
+# Clientes y solicitudes recientes que se recuerdan como máximo
+MAX_RECORDADOS = 50_000
+
+# Segundos antes de reintentar un lote que no se pudo escribir
+REINTENTO = 1.0
+
+
+class Solicitud(SQLModel, table=True):
+    """Solicitud de contacto enviada desde la landing"""
+
+    id: int | None = Field(default=None, primary_key=True)
+    nombre: str
+    entidad: str
+    municipio: str
+    mensaje: str
+    recibida: datetime = Field(index=True)
+
+
+class SolicitudRechazada(ValueError):
+    """La solicitud no se encoló; el mensaje se muestra al usuario"""
+
+
+_cola: asyncio.Queue[dict] = asyncio.Queue(maxsize=MAX_EN_COLA)
+_ventanas: OrderedDict[str, tuple[float, int]] = OrderedDict()
+_recientes: OrderedDict[str, float] = OrderedDict()
+
+
+def _limpiar(datos: dict) -> dict[str, str]:
+    fila = {}
+    for campo, largo in CAMPOS.items():
+        valor = str(datos.get(campo, ""))
+        if campo in MULTILINEA:
+            valor = valor.replace("\r\n", "\n").replace("\r", "\n").strip()
+        else:
+            valor = " ".join(valor.split())
+        if not valor:
+            raise SolicitudRechazada("Completa todos los campos del formulario.")
+        if len(valor) > largo:
+            raise SolicitudRechazada(f"El campo {campo} admite máximo {largo} caracteres.")
+        fila[campo] = valor
+    return fila
+
+
+def _recordar(memoria: OrderedDict, clave: str, valor) -> None:
+    memoria[clave] = valor
+    memoria.move_to_end(clave)
+    if len(memoria) > MAX_RECORDADOS:
+        memoria.popitem(last=False)
+
+
+def _huella(fila: dict[str, str]) -> str:
+    return hashlib.blake2b("\0".join(fila.values()).casefold().encode(), digest_size=16).hexdigest()
+
+
+def _dentro_del_limite(cliente: str, ahora: float) -> bool:
+    inicio, cuenta = _ventanas.get(cliente, (ahora, 0))
+    if ahora - inicio >= VENTANA:
+        inicio, cuenta = ahora, 0
+    if cuenta >= MAX_POR_VENTANA:
+        return False
+    _recordar(_ventanas, cliente, (inicio, cuenta + 1))
+    return True
+
+
+def recibir(datos: dict, cliente: str) -> None:
+    """Valida y encola una solicitud sin bloquear.
+
+    Los duplicados se aceptan sin volver a encolarse. Lanza SolicitudRechazada
+    si los datos no son válidos, si el cliente superó su límite o si la cola
+    está llena.
+    """
+    fila = _limpiar(datos)
+    huella = _huella(fila)
+    ahora = time.monotonic()
+    if ahora - _recientes.get(huella, -PLAZO_DUPLICADO) < PLAZO_DUPLICADO:
+        return
+    if not _dentro_del_limite(cliente, ahora):
+        raise SolicitudRechazada("Has enviado varias solicitudes seguidas; intenta en un minuto.")
+    fila["recibida"] = datetime.now(timezone.utc)
+    try:
+        _cola.put_nowait(fila)
+    except asyncio.QueueFull:
+        raise SolicitudRechazada("Estamos recibiendo muchas solicitudes; intenta en unos minutos.") from None
+    _recordar(_recientes, huella, ahora)
+
+
+def _insertar(lote: list[dict]) -> None:
+    with basedatos.motor().begin() as conexion:
+        conexion.execute(sqlalchemy.insert(Solicitud), lote)
+
+
+def _vaciar(maximo: int) -> list[dict]:
+    lote = []
+    while len(lote) < maximo and not _cola.empty():
+        lote.append(_cola.get_nowait())
+    return lote
+
+
+def _ultimo_intento(lote: list[dict]) -> None:
+    """Inserción al apagar: si falla se registra, no reemplaza a la cancelación"""
+    try:
+        _insertar(lote)
+    except Exception as error:
+        console.error(f"Se perdieron {len(lote)} solicitudes al apagar: {error}")
+
+
+async def _escribir() -> None:
+    while True:
+        # Lo que se acumuló mientras se escribía el lote anterior va en el siguiente
+        lote = [await _cola.get(), *_vaciar(MAX_LOTE - 1)]
+        while True:
+            try:
+                await asyncio.to_thread(_insertar, lote)
+                break
+            except sqlalchemy.exc.SQLAlchemyError as error:
+                console.error(f"No se pudieron guardar {len(lote)} solicitudes: {error}")
+                try:
+                    await asyncio.sleep(REINTENTO)
+                except asyncio.CancelledError:
+                    # Último intento al apagar para no perder el lote
+                    _ultimo_intento(lote)
+                    raise
+            except Exception as error:
+                # Un error que no es de la base no se arregla reintentando; el
+                # escritor sigue vivo para que la cola no se llene
+                console.error(f"Se descartaron {len(lote)} solicitudes por un error inesperado: {error!r}")
+                break
+
+
+@contextlib.asynccontextmanager
+async def escritura_diferida():
+    """Tarea de vida de la app: escribe la cola en segundo plano y la vacía al apagar"""
+    tarea = asyncio.create_task(_escribir())
+    try:
+        yield
+    finally:
+        tarea.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await tarea
+        if pendientes := _vaciar(MAX_EN_COLA):
+            _ultimo_intento(pendientes)
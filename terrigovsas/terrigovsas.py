@@ -1,6 +1,15 @@
 import reflex as rx
 from typing import List
 
+from terrigovsas import analitica, estilos, fuentes, metricas, solicitudes
+from terrigovsas.contenido import Servicio, contenido
+from terrigovsas.diferido import bajo_el_pliegue
+from terrigovsas.enlaces import enlace
+from terrigovsas.formulario import campo, formulario_contacto
+from terrigovsas.iconos import icono
+from terrigovsas.imagenes import imagen_responsiva, manifiesto
+from terrigovsas.secciones import seccion
+
 # Configuración de colores basada en el logo
 colors = {
     "primary": "#007BFF",
@@ -10,6 +19,7 @@ colors = {
     "light": "#FFFFFF",
     "gray": "#6C757D"
 }
+estilos.registrar_paleta(colors)
 
 # Configuración de la aplicación
 config = rx.Config(
@@ -26,17 +36,16 @@ config = rx.Config(
     }
 )
 
+@seccion(colors, imagen_responsiva, icono, manifiesto(), contenido().contacto)
 def navbar() -> rx.Component:
     """Componente de navegación principal - Ahora responsive"""
-    return rx.box(
+    # El logo es la única imagen por encima del pliegue (el hero es solo texto):
+    # `prioritaria` la marca para que terrigovsas.build.recursos la precargue
+    return rx.el.header(
         rx.hstack(
             # Logo y nombre de la empresa
             rx.hstack(
-                rx.image(
-                    src="https://i.postimg.cc/PJgFKg6x/Icon-2-SVG.png",
-                    alt="Logo de la empresa",
-                    width=rx.breakpoints(initial="35px", sm="42px", md="50px")
-                ),
+                imagen_responsiva("logo", alt="Logo de la empresa", prioritaria=True, height="auto"),
                 rx.vstack(
                     rx.text(
                         "TerriGov S.A.S.",
@@ -71,13 +80,14 @@ def navbar() -> rx.Component:
             # Links directos para móvil (simplificado)
             rx.hstack(
                 rx.link(
-                    rx.icon("phone", size=18, color=colors["primary"]),
-                    href="https://wa.me/573207803362",
+                    icono("phone", size=18, color=colors["primary"]),
+                    href=contenido().contacto.whatsapp,
                     is_external=True,
+                    custom_attrs={"data-cta": "whatsapp-navbar"},
                     _hover={"color": colors["secondary"]}
                 ),
                 rx.link(
-                    rx.icon("mail", size=18, color=colors["primary"]),
+                    icono("mail", size=18, color=colors["primary"]),
                     href="#contacto",
                     _hover={"color": colors["secondary"]}
                 ),
@@ -98,8 +108,10 @@ def navbar() -> rx.Component:
         z_index="1000"
     )
 
+@seccion(colors, icono, contenido().contacto)
 def hero_section() -> rx.Component:
     """Sección hero principal - Responsive"""
+    contacto = contenido().contacto
     return rx.box(
         rx.container(
             rx.vstack(
@@ -128,7 +140,7 @@ def hero_section() -> rx.Component:
                 rx.link(
                     rx.button(
                         rx.hstack(
-                            rx.icon("message-circle", size=14),
+                            icono("message-circle", size=14),
                             rx.text(
                                 "Habla con nosotros", 
                                 size=rx.breakpoints(initial="2", sm="3", md="4"), 
@@ -158,8 +170,9 @@ def hero_section() -> rx.Component:
                         transition="all 0.3s ease",
                         white_space="nowrap"
                     ),
-                    href="https://wa.me/573207803362",
-                    is_external=True
+                    href=contacto.whatsapp,
+                    is_external=True,
+                    custom_attrs={"data-cta": "whatsapp-hero"}
                 ),
                 spacing=rx.breakpoints(initial="3", sm="5", md="6"),
                 align="center",
@@ -183,18 +196,22 @@ def hero_section() -> rx.Component:
             "left": "0",
             "right": "0",
             "bottom": "0",
-            "background": "url('/hero-bg.jpg') center/cover",
+            # Fondo decorativo en CSS: no cuesta ninguna petición
+            "background": (
+                f"radial-gradient(circle at 20% 30%, {colors['primary']} 0%, transparent 45%), "
+                f"radial-gradient(circle at 80% 70%, {colors['accent']} 0%, transparent 45%)"
+            ),
             "opacity": "0.1",
             "z_index": "-1"
         }
     )
 
-def service_card(title: str, description: str, icon: str) -> rx.Component:
-    """Componente de tarjeta de servicio - Responsive"""
-    return rx.box(
+def service_card(title: str, description: str, icon: str, cta: str, ruta: str) -> rx.Component:
+    """Componente de tarjeta de servicio - Responsive; enlaza a la página del servicio"""
+    return enlace(
         rx.vstack(
             rx.box(
-                rx.icon(icon, size=32, color=colors["primary"]),
+                icono(icon, size=32, color=colors["primary"]),
                 padding=rx.breakpoints(initial="0.75rem", sm="0.875rem", md="1rem"),
                 background=f"linear-gradient(135deg, {colors['primary']}15, {colors['secondary']}15)",
                 border_radius="50%",
@@ -220,43 +237,15 @@ def service_card(title: str, description: str, icon: str) -> rx.Component:
             "box_shadow": "0 8px 30px rgba(0,123,255,0.2)"
         },
         transition="all 0.3s ease",
-        height="100%"
+        height="100%",
+        display="block",
+        to=ruta,
+        custom_attrs={"data-cta": cta}
     )
 
+@seccion(colors, service_card, enlace, icono, contenido().servicios)
 def services_section() -> rx.Component:
     """Sección de servicios - Responsive"""
-    services = [
-        {
-            "title": "Observatorios de Datos",
-            "description": "Plataformas avanzadas para la visualización y análisis de datos territoriales en tiempo real.",
-            "icon": "bar-chart-3"
-        },
-        {
-            "title": "Decisiones Basadas en Datos",
-            "description": "Herramientas de inteligencia artificial para optimizar la toma de decisiones públicas.",
-            "icon": "brain"
-        },
-        {
-            "title": "Automatización de Contratación",
-            "description": "Sistemas inteligentes para agilizar y transparentar los procesos de contratación estatal.",
-            "icon": "file-text"
-        },
-        {
-            "title": "Transformación Digital",
-            "description": "Modernización integral de procesos y servicios en entidades públicas.",
-            "icon": "smartphone"
-        },
-        {
-            "title": "Inteligencia Artificial",
-            "description": "Soluciones de IA aplicadas a la gestión pública y análisis predictivo.",
-            "icon": "cpu"
-        },
-        {
-            "title": "Equipamiento Tecnológico",
-            "description": "Computadores, servidores, redes y toda la tecnología necesaria para tu transformación digital.",
-            "icon": "network"
-        }
-    ]
     
     return rx.box(
         rx.container(
@@ -276,8 +265,9 @@ def services_section() -> rx.Component:
                     margin_bottom="3rem"
                 ),
                 rx.grid(
-                    *[service_card(service["title"], service["description"], service["icon"]) 
-                      for service in services],
+                    *[service_card(
+                        servicio.titulo, servicio.descripcion, servicio.icono, f"servicio-{servicio.slug}", servicio.ruta
+                      ) for servicio in contenido().servicios],
                     columns=rx.breakpoints(initial="1", sm="2", md="3"),
                     spacing=rx.breakpoints(initial="4", sm="5", md="6"),
                     width="100%"
@@ -292,6 +282,7 @@ def services_section() -> rx.Component:
         background="#F8F9FA"
     )
 
+@seccion(colors, imagen_responsiva, icono, manifiesto())
 def about_section() -> rx.Component:
     """Sección sobre nosotros - Responsive"""
     return rx.box(
@@ -333,7 +324,7 @@ def about_section() -> rx.Component:
                     rx.flex(
                         rx.vstack(
                             rx.box(
-                                rx.icon("lightbulb", size=20, color=colors["accent"]),
+                                icono("lightbulb", size=20, color=colors["accent"]),
                                 padding="0.5rem",
                                 background=f"{colors['accent']}20",
                                 border_radius="8px"
@@ -344,7 +335,7 @@ def about_section() -> rx.Component:
                         ),
                         rx.vstack(
                             rx.box(
-                                rx.icon("eye", size=20, color=colors["accent"]),
+                                icono("eye", size=20, color=colors["accent"]),
                                 padding="0.5rem",
                                 background=f"{colors['accent']}20",
                                 border_radius="8px"
@@ -355,7 +346,7 @@ def about_section() -> rx.Component:
                         ),
                         rx.vstack(
                             rx.box(
-                                rx.icon("zap", size=20, color=colors["accent"]),
+                                icono("zap", size=20, color=colors["accent"]),
                                 padding="0.5rem",
                                 background=f"{colors['accent']}20",
                                 border_radius="8px"
@@ -377,10 +368,10 @@ def about_section() -> rx.Component:
                 # Columna derecha - Imagen destacada
                 rx.box(
                     rx.box(
-                        rx.image(
-                            src="https://i.postimg.cc/MGCkv2tb/Pantalla-Civi.png",
+                        imagen_responsiva(
+                            "pantalla-civi",
                             alt="TerriGov - Territorio Digital",
-                            width=rx.breakpoints(initial="300px", sm="400px", md="450px"),
+                            diferida=True,
                             height=rx.breakpoints(initial="300px", sm="400px", md="450px"),
                             object_fit="contain",
                             border_radius="8px"
@@ -409,8 +400,10 @@ def about_section() -> rx.Component:
         background=colors["light"]
     )
 
+@seccion(colors, contenido().contacto, formulario_contacto, campo, icono)
 def contact_section() -> rx.Component:
     """Sección de contacto - Responsive"""
+    contacto = contenido().contacto
     return rx.box(
         rx.container(
             rx.vstack(
@@ -427,28 +420,35 @@ def contact_section() -> rx.Component:
                     color=colors["light"],
                     text_align="center",
                     opacity="0.9",
+                    margin_bottom="2rem"
+                ),
+
+                rx.box(
+                    formulario_contacto(colors),
+                    width="100%",
+                    max_width="720px",
                     margin_bottom="3rem"
                 ),
                 
                 rx.grid(
                     rx.vstack(
-                        rx.icon("mail", size=26, color=colors["accent"]),
+                        icono("mail", size=26, color=colors["accent"]),
                         rx.text("Email", size=rx.breakpoints(initial="3", sm="3", md="4"), weight="bold", color=colors["light"]),
-                        rx.text("info@terrigov.co", size=rx.breakpoints(initial="2", sm="2", md="3"), color=colors["light"], opacity="0.8"),
+                        rx.text(contacto.email, size=rx.breakpoints(initial="2", sm="2", md="3"), color=colors["light"], opacity="0.8"),
                         spacing="2",
                         align="center"
                     ),
                     rx.vstack(
-                        rx.icon("message-circle", size=26, color=colors["accent"]),
+                        icono("message-circle", size=26, color=colors["accent"]),
                         rx.text("WhatsApp", size=rx.breakpoints(initial="3", sm="3", md="4"), weight="bold", color=colors["light"]),
-                        rx.text("+57 320 780 3362", size=rx.breakpoints(initial="2", sm="2", md="3"), color=colors["light"], opacity="0.8"),
+                        rx.text(contacto.telefono, size=rx.breakpoints(initial="2", sm="2", md="3"), color=colors["light"], opacity="0.8"),
                         spacing="2",
                         align="center"
                     ),
                     rx.vstack(
-                        rx.icon("map-pin", size=26, color=colors["accent"]),
+                        icono("map-pin", size=26, color=colors["accent"]),
                         rx.text("Ubicación", size=rx.breakpoints(initial="3", sm="3", md="4"), weight="bold", color=colors["light"]),
-                        rx.text("Colombia", size=rx.breakpoints(initial="2", sm="2", md="3"), color=colors["light"], opacity="0.8"),
+                        rx.text(contacto.ubicacion, size=rx.breakpoints(initial="2", sm="2", md="3"), color=colors["light"], opacity="0.8"),
                         spacing="2",
                         align="center"
                     ),
@@ -460,7 +460,7 @@ def contact_section() -> rx.Component:
                 rx.link(
                     rx.button(
                         rx.hstack(
-                            rx.icon("message-circle", size=18),
+                            icono("message-circle", size=18),
                             rx.text("Iniciar Conversación", size=rx.breakpoints(initial="3", sm="3", md="4"), weight="medium"),
                             spacing="2",
                             align="center"
@@ -478,8 +478,9 @@ def contact_section() -> rx.Component:
                         },
                         transition="all 0.3s ease"
                     ),
-                    href="https://wa.me/573207803362",
-                    is_external=True
+                    href=contacto.whatsapp,
+                    is_external=True,
+                    custom_attrs={"data-cta": "whatsapp-contacto"}
                 ),
                 
                 spacing=rx.breakpoints(initial="4", sm="5", md="6"),
@@ -492,6 +493,7 @@ def contact_section() -> rx.Component:
         background=f"linear-gradient(135deg, {colors['dark']} 0%, {colors['primary']} 100%)"
     )
 
+@seccion(colors, icono)
 def footer() -> rx.Component:
     """Pie de página - Responsive"""
     return rx.box(
@@ -506,12 +508,12 @@ def footer() -> rx.Component:
                     ),
                     rx.hstack(
                         rx.link(
-                            rx.icon("linkedin", size=18, color=colors["gray"]),
+                            icono("linkedin", size=18, color=colors["gray"]),
                             href="#",
                             _hover={"color": colors["primary"]}
                         ),
                         rx.link(
-                            rx.icon("instagram", size=18, color=colors["gray"]),
+                            icono("instagram", size=18, color=colors["gray"]),
                             href="#",
                             _hover={"color": colors["primary"]}
                         ),
@@ -536,18 +538,116 @@ def footer() -> rx.Component:
 
 def index() -> rx.Component:
     """Página principal"""
-    return rx.box(
+    pagina = rx.box(
         navbar(),
         hero_section(),
-        services_section(),
-        about_section(),
-        contact_section(),
+        # El hero ocupa toda la altura: el resto queda bajo el pliegue
+        bajo_el_pliegue(services_section(), "servicios", altura="1400px"),
+        bajo_el_pliegue(about_section(), "sobre-nosotros", altura="900px"),
+        bajo_el_pliegue(contact_section(), "contacto", altura="700px"),
+        bajo_el_pliegue(footer(), "footer", altura="120px"),
+        font_family=fuentes.PILA
+    )
+    # Las secciones ya vienen extraídas; esto cubre el contenedor
+    estilos.extraer(pagina)
+    return pagina
+
+def service_page(servicio: Servicio) -> rx.Component:
+    """Página de un servicio: su propia ruta y su propio chunk de JS"""
+    contacto = contenido().contacto
+    pagina = rx.box(
+        rx.el.header(
+            rx.hstack(
+                enlace(
+                    rx.hstack(
+                        imagen_responsiva("logo", alt="Logo de la empresa", prioritaria=True, height="auto"),
+                        rx.text("TerriGov S.A.S.", size=rx.breakpoints(initial="3", sm="5", md="6"), weight="bold"),
+                        spacing=rx.breakpoints(initial="2", sm="3", md="4"),
+                        align="center"
+                    ),
+                    to="/",
+                    color=colors["dark"]
+                ),
+                enlace(
+                    rx.hstack(icono("arrow-left", size=16), rx.text("Todos los servicios"), spacing="2", align="center"),
+                    to="/#servicios",
+                    color=colors["primary"]
+                ),
+                justify="between",
+                align="center",
+                width="100%"
+            ),
+            background=colors["light"],
+            padding=rx.breakpoints(initial="0.5rem 1rem", sm="0.75rem 1.5rem", md="1rem 2rem"),
+            box_shadow="0 2px 4px rgba(0,0,0,0.1)",
+            position="sticky",
+            top="0",
+            z_index="1000"
+        ),
+        rx.box(
+            rx.vstack(
+                icono(servicio.icono, size=48, color=colors["light"]),
+                rx.heading(
+                    servicio.titulo,
+                    as_="h1",
+                    size=rx.breakpoints(initial="7", sm="8", md="9"),
+                    color=colors["light"],
+                    text_align="center"
+                ),
+                rx.text(
+                    servicio.descripcion,
+                    size=rx.breakpoints(initial="3", sm="4", md="5"),
+                    color=colors["light"],
+                    opacity="0.9",
+                    text_align="center",
+                    max_width="40rem"
+                ),
+                spacing="4",
+                align="center"
+            ),
+            padding=rx.breakpoints(initial="3rem 1rem", sm="4rem 1.5rem", md="5rem 2rem"),
+            background=f"linear-gradient(135deg, {colors['primary']} 0%, {colors['secondary']} 100%)"
+        ),
+        rx.container(
+            rx.vstack(
+                *[
+                    rx.text(parrafo, size=rx.breakpoints(initial="3", sm="3", md="4"), color=colors["dark"], line_height="1.7")
+                    for parrafo in servicio.detalle.strip().split("\n\n")
+                ],
+                rx.link(
+                    rx.button(
+                        icono("message-circle", size=16),
+                        "Conversemos sobre tu proyecto",
+                        size="3",
+                        background=colors["accent"],
+                        color=colors["light"],
+                        border_radius="50px",
+                        _hover={"background": "#00B889"}
+                    ),
+                    href=contacto.whatsapp,
+                    is_external=True,
+                    custom_attrs={"data-cta": f"whatsapp-{servicio.slug}"}
+                ),
+                spacing="5",
+                align="start"
+            ),
+            max_width="800px",
+            padding=rx.breakpoints(initial="2rem 1rem", sm="3rem 1.5rem", md="4rem 2rem")
+        ),
         footer(),
-        font_family="Inter, system-ui, sans-serif"
+        font_family=fuentes.PILA
     )
+    estilos.extraer(pagina)
+    return pagina
 
 # Configuración de la aplicación
 app = rx.App(
+    head_components=[
+        *fuentes.componentes_head(),
+        rx.el.script(custom_attrs={"dangerouslySetInnerHTML": {"__html": analitica.SCRIPT}}),
+    ],
+    # El último envuelve a los demás: las métricas miden también los beacons
+    api_transformer=[analitica.con_beacons, metricas.instrumentar],
     theme=rx.theme(
         appearance="light",
         has_background=True,
@@ -556,4 +656,17 @@ app = rx.App(
     )
 )
 
-app.add_page(index, route="/")
\ No newline at end of file
+app.register_lifespan_task(solicitudes.escritura_diferida)
+app.register_lifespan_task(analitica.volcado_periodico)
+app.add_middleware(metricas.LatenciaEventos())
+# El único evento es el envío del formulario: el websocket se abre al enviarlo
+app.add_page(index, route="/", context={"conexion": "diferida"})
+# Una página por servicio del modelo de contenido; ninguna usa estado
+for servicio in contenido().servicios:
+    app.add_page(
+        service_page(servicio),
+        route=servicio.ruta,
+        title=f"{servicio.titulo} · TerriGov S.A.S.",
+        description=servicio.descripcion,
+        context={"conexion": "sin_estado"}
+    )